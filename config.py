@@ -1,6 +1,7 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 
 class Settings(BaseSettings):
@@ -59,4 +60,14 @@ class Settings(BaseSettings):
         return self.get_absolute_path(self.DOCUMENTS_DIR)
 
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings (env/.env parsed only once)"""
+    return Settings()
+
+
+def __getattr__(name: str) -> Any:
+    """Global `settings` instance, created on first access (not at import)"""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,78 @@
+"""
+Async Artifact Writer
+Zapisuje generované artefakty (session notes, docs) v background vlákne
+
+submit() sa vráti okamžite, zápis na disk beží súbežne s ďalšou prácou
+(napr. ďalším Claude API volaním). close() / flush() počkajú na dokončenie.
+"""
+import queue
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+
+# Signal for the background thread to stop
+_STOP = object()
+
+
+class AsyncArtifactWriter:
+    """Textové súbory zapisované jedným background vláknom"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._drain, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, path: Union[str, Path], text: str):
+        """Zaradí súbor na zápis a hneď sa vráti
+
+        Args:
+            path: Cieľová cesta
+            text: Obsah súboru (zapíše sa ako UTF-8 s LF newlines)
+        """
+        self._queue.put((Path(path), text))
+
+    def flush(self):
+        """Počká, kým sa zapíšu všetky zaradené súbory
+
+        Raises:
+            Exception: Prvá chyba zápisu z background vlákna
+        """
+        self._queue.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self):
+        """Dopíše zaradené súbory a ukončí background vlákno"""
+        self._queue.put(_STOP)
+        self._thread.join()
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+            return
+        # Body already failed: finish queued writes, but let its exception propagate
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _drain(self):
+        """Background slučka: zapisuje súbory z fronty v poradí zaradenia"""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                path, text = item
+                path.write_text(text, encoding='utf-8', newline='\n')
+            except BaseException as e:
+                # Keep the first error for flush(); later writes still run
+                if self._error is None:
+                    self._error = e
+            finally:
+                self._queue.task_done()
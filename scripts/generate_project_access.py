@@ -6,17 +6,27 @@ WITH CACHE BUSTING for fresh GitHub content
 UAE Legal Agent - AI-powered legal analysis system for UAE law
 """
 import os
+import heapq
 import json
 import subprocess
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 from typing import Optional
 
+try:
+    import orjson
+except ImportError:  # Optional speedup - stdlib json is the fallback
+    orjson = None
+
 # Configuration
 PROJECT_NAME = "uae-legal-agent"
 GITHUB_REPO = "rauschiccsk/uae-legal-agent"
 OUTPUT_FILE = "docs/project_file_access.json"
 
+# Sort key for manifest file entries
+PATH_KEY = itemgetter("path")
+
 # Categories to scan - FIXED
 CATEGORIES = {
     "documentation": {
@@ -73,8 +83,40 @@ CATEGORIES = {
 }
 
 
+def _read_head_sha(git_dir: Path) -> Optional[str]:
+    """Resolve HEAD from .git files without spawning git"""
+    head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    if not head.startswith("ref: "):
+        return head or None  # Detached HEAD already holds the SHA
+
+    ref = head[5:]
+    ref_file = git_dir / ref
+    if ref_file.is_file():
+        return ref_file.read_text(encoding="utf-8").strip() or None
+
+    # Ref not loose - look it up in packed-refs
+    packed_refs = git_dir / "packed-refs"
+    if packed_refs.is_file():
+        for line in packed_refs.read_text(encoding="utf-8").splitlines():
+            sha, _, name = line.partition(" ")
+            if name == ref:
+                return sha
+    return None
+
+
 def get_current_commit_sha(repo_path: Path) -> Optional[str]:
     """Get current Git commit SHA"""
+    # Fast path: read .git/HEAD directly (no subprocess)
+    git_dir = repo_path / ".git"
+    if git_dir.is_dir():
+        try:
+            sha = _read_head_sha(git_dir)
+            if sha:
+                return sha
+        except OSError as e:
+            print(f"Warning: Could not read .git/HEAD: {e}")
+
+    # Fallback: .git is a file (worktree/submodule) or ref is unresolvable
     try:
         result = subprocess.run(
             ['git', 'rev-parse', 'HEAD'],
@@ -132,47 +174,66 @@ def matches_include_pattern(file_name, patterns):
     return False
 
 
+def iter_file_entries(dir_path, recursive, exclude_dirs=frozenset()):
+    """Yield os.DirEntry objects for all files under dir_path
+
+    Subdirectories named in exclude_dirs are pruned before descent,
+    so nothing below them is ever listed. Symlinked directories are
+    not descended into (same as Path.glob('**/*')), so link loops
+    cannot recurse forever.
+    """
+    pending = [dir_path]
+    while pending:
+        with os.scandir(pending.pop()) as it:
+            for entry in it:
+                if entry.is_file():
+                    yield entry
+                elif recursive and entry.is_dir(follow_symlinks=False) and entry.name not in exclude_dirs:
+                    pending.append(entry.path)
+
+
 def scan_category(category_name, config, base_path, base_url, cache_version):
     """Scan files for a specific category"""
     files = []
+    base_str = str(base_path)
+    abs_base = base_str + os.sep
+    extensions = config["extensions"]
+    include_patterns = config.get("include_patterns")
+    exclude_dirs = frozenset(config.get("exclude_dirs", ()))
 
     for directory in config["directories"]:
-        dir_path = base_path / directory if directory != "." else base_path
+        # Join as strings so every entry.path starts with abs_base
+        dir_path = os.path.join(base_str, directory) if directory != "." else base_str
 
-        if not dir_path.exists():
+        if not os.path.isdir(dir_path):
             print(f"   ⚠️  Directory not found: {dir_path}")
             continue
 
-        # Scan directory
-        if config["recursive"]:
-            pattern = "**/*"
-        else:
-            pattern = "*"
-
-        for file_path in dir_path.glob(pattern):
-            if file_path.is_file() and not should_skip(file_path):
-                # Check if in excluded directory
-                if any(excl in str(file_path) for excl in config.get("exclude_dirs", [])):
-                    continue
-
-                # Check extension
-                if file_path.suffix in config["extensions"]:
-                    # Check include patterns if specified
-                    if "include_patterns" in config:
-                        if not matches_include_pattern(file_path.name, config["include_patterns"]):
-                            continue
-
-                    relative_path = file_path.relative_to(base_path)
-                    clean_path = str(relative_path).replace(os.sep, '/')
-
-                    files.append({
-                        "path": clean_path,
-                        "raw_url": f"{base_url}/{clean_path}?v={cache_version}",
-                        "size": file_path.stat().st_size,
-                        "extension": file_path.suffix,
-                        "name": file_path.name,
-                        "category": category_name
-                    })
+        for entry in iter_file_entries(dir_path, config["recursive"], exclude_dirs):
+            if should_skip(entry.path):
+                continue
+
+            # Check extension
+            name = entry.name
+            dot = name.rfind('.')
+            suffix = name[dot:] if dot > 0 else ''
+            if suffix not in extensions:
+                continue
+
+            # Check include patterns if specified
+            if include_patterns is not None and not matches_include_pattern(name, include_patterns):
+                continue
+
+            clean_path = entry.path[len(abs_base):].replace(os.sep, '/')
+
+            files.append({
+                "path": clean_path,
+                "raw_url": f"{base_url}/{clean_path}?v={cache_version}",
+                "size": entry.stat().st_size,
+                "extension": suffix,
+                "name": name,
+                "category": category_name
+            })
 
     return files
 
@@ -223,7 +284,7 @@ def generate_manifest():
     base_url = f"https://raw.githubusercontent.com/{GITHUB_REPO}/{ref}"
 
     # Collect all files by category
-    all_files = []
+    per_category_files = []
     category_stats = {}
 
     for category_name, category_config in CATEGORIES.items():
@@ -233,13 +294,14 @@ def generate_manifest():
         print(f"   Extensions: {', '.join(category_config['extensions'])}")
 
         files = scan_category(category_name, category_config, project_root, base_url, cache_version)
-        all_files.extend(files)
+        files.sort(key=PATH_KEY)
+        per_category_files.append(files)
         category_stats[category_name] = len(files)
 
         print(f"   ✅ Found: {len(files)} files")
 
-    # Sort files by path
-    all_files.sort(key=lambda x: x["path"])
+    # Merge the per-category sorted lists into one list sorted by path
+    all_files = list(heapq.merge(*per_category_files, key=PATH_KEY))
 
     # Create quick access section
     quick_access = {
@@ -321,8 +383,14 @@ def generate_manifest():
     output_path = project_root / OUTPUT_FILE
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        output_path.write_bytes(
+            orjson.dumps(manifest, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        )
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+            f.write("\n")
 
     print("\n" + "=" * 70)
     print("✅ MANIFEST GENERATED SUCCESSFULLY")
@@ -3,6 +3,9 @@
 
 import sys
 import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
 from typing import List, Dict
 
@@ -24,29 +27,101 @@ from utils.vector_store_simple import VectorStore
 from utils.embeddings import EmbeddingsClient
 from utils.claude_client import ClaudeClient
 
+# Single retrieved document chunk
+SearchHit = namedtuple("SearchHit", "text source page distance")
+
+# Pipeline components created lazily by cached_property
+_COMPONENTS = ('vector_store', 'embeddings_client', 'claude_client')
+
+# Separator placed between documents in the Claude context
+_SEP = "\n" + "=" * 70 + "\n"
+
+SYSTEM_PROMPT = """You are a legal analysis assistant specializing in UAE law.
+
+Your role:
+- Analyze legal questions based on provided UAE legal documents
+- Provide clear, accurate legal information
+- Cite specific articles and laws
+- Explain complex legal concepts simply
+- Always state when information is not found in the provided documents
+
+Important:
+- Base answers ONLY on the provided legal documents
+- If the answer is not in the documents, say so clearly
+- Cite specific articles, sections, and page numbers
+- Use clear, professional language"""
+
+# Static parts of the user prompt; query and context are joined in between
+_USER_PROMPT_HEAD = """Based on the following UAE legal documents, please answer this question:
+
+QUESTION: """
+
+_USER_PROMPT_DOCS = """
+
+RELEVANT LEGAL DOCUMENTS:
+"""
+
+_USER_PROMPT_TAIL = """
+
+Please provide:
+1. Direct answer to the question
+2. Relevant articles and laws cited
+3. Page references from source documents
+4. Any important context or clarifications
+
+If the answer is not in the provided documents, please state that clearly."""
+
 
 class LegalQueryAgent:
     """Legal query agent with RAG pipeline."""
 
     def __init__(self):
-        """Initialize agent components."""
-        print(f"{Fore.CYAN}Initializing Legal Query Agent...{Style.RESET_ALL}")
+        """Initialize agent.
+
+        Heavy components (vector store, API clients) are created lazily
+        on first use, so startup stays fast for short sessions.
+        """
+        print(f"{Fore.CYAN}Initializing Legal Query Agent (components load on first query)...{Style.RESET_ALL}\n")
 
-        # Load vector store
+    @cached_property
+    def vector_store(self) -> VectorStore:
+        """Vector store, loaded on first search."""
         print(f"{Fore.YELLOW}Loading vector store...{Style.RESET_ALL}")
-        self.vector_store = VectorStore()
-        self.vector_store.initialize_db()
+        vector_store = VectorStore()
+        vector_store.initialize_db()
 
-        stats = self.vector_store.get_collection_stats()
+        stats = vector_store.get_collection_stats()
         print(f"{Fore.GREEN}✓ Loaded {stats['document_count']} legal documents{Style.RESET_ALL}")
+        return vector_store
+
+    @cached_property
+    def embeddings_client(self) -> EmbeddingsClient:
+        """Embeddings client, created on first search."""
+        return EmbeddingsClient()
 
-        # Initialize clients
-        self.embeddings_client = EmbeddingsClient()
-        self.claude_client = ClaudeClient()
+    @cached_property
+    def claude_client(self) -> ClaudeClient:
+        """Claude client, created on first analysis."""
+        return ClaudeClient()
+
+    def _warm_up(self) -> None:
+        """Create all pipeline components concurrently.
+
+        The constructors are independent (disk load, network clients),
+        so building them in parallel hides their combined latency.
+        Only the first call does any work; later calls return at once.
+        """
+        if all(name in self.__dict__ for name in _COMPONENTS):
+            return
+
+        with ThreadPoolExecutor(max_workers=len(_COMPONENTS)) as executor:
+            futures = [executor.submit(getattr, self, name) for name in _COMPONENTS]
+            for future in futures:
+                future.result()
 
         print(f"{Fore.GREEN}✓ Agent ready!{Style.RESET_ALL}\n")
 
-    def search_legal_docs(self, query: str, top_k: int = 5) -> List[Dict]:
+    def search_legal_docs(self, query: str, top_k: int = 5) -> List[SearchHit]:
         """Search for relevant legal documents.
 
         Args:
@@ -54,7 +129,7 @@ class LegalQueryAgent:
             top_k: Number of results to return
 
         Returns:
-            List of relevant document chunks
+            List of SearchHit tuples for relevant document chunks
         """
         # Generate query embedding
         query_emb = self.embeddings_client.generate_embedding(query)
@@ -65,20 +140,17 @@ class LegalQueryAgent:
             n_results=top_k
         )
 
-        # Format results
-        formatted = []
-        if results['documents'][0]:
-            for i in range(len(results['documents'][0])):
-                formatted.append({
-                    'text': results['documents'][0][i],
-                    'source': results['metadatas'][0][i]['source'],
-                    'page': results['metadatas'][0][i]['page'],
-                    'distance': results['distances'][0][i]
-                })
+        # Unpack the first (only) query's columns once
+        documents = results['documents'][0]
+        metadatas = results['metadatas'][0]
+        distances = results['distances'][0]
 
-        return formatted
+        return [
+            SearchHit(text, meta['source'], meta['page'], distance)
+            for text, meta, distance in zip(documents, metadatas, distances)
+        ]
 
-    def format_context(self, search_results: List[Dict]) -> str:
+    def format_context(self, search_results: List[SearchHit]) -> str:
         """Format search results as context for Claude.
 
         Args:
@@ -87,18 +159,14 @@ class LegalQueryAgent:
         Returns:
             Formatted context string
         """
-        context_parts = []
-
-        for i, result in enumerate(search_results, 1):
-            context_parts.append(
-                f"[Document {i}]\n"
-                f"Source: {result['source']}\n"
-                f"Page: {result['page']}\n"
-                f"Relevance: {1 - result['distance']:.2%}\n"
-                f"\n{result['text']}\n"
-            )
-
-        return "\n" + "=" * 70 + "\n".join(context_parts)
+        return _SEP.join(
+            f"[Document {i}]\n"
+            f"Source: {result.source}\n"
+            f"Page: {result.page}\n"
+            f"Relevance: {1 - result.distance:.2%}\n"
+            f"\n{result.text}\n"
+            for i, result in enumerate(search_results, 1)
+        )
 
     def analyze_query(self, query: str, top_k: int = 5) -> Dict:
         """Analyze legal query using RAG pipeline.
@@ -110,6 +178,8 @@ class LegalQueryAgent:
         Returns:
             Dict with analysis results
         """
+        self._warm_up()
+
         print(f"{Fore.CYAN}Searching legal documents...{Style.RESET_ALL}")
 
         # 1. Retrieve relevant documents
@@ -127,35 +197,7 @@ class LegalQueryAgent:
         context = self.format_context(search_results)
 
         # 3. Build Claude prompt
-        system_prompt = """You are a legal analysis assistant specializing in UAE law.
-
-Your role:
-- Analyze legal questions based on provided UAE legal documents
-- Provide clear, accurate legal information
-- Cite specific articles and laws
-- Explain complex legal concepts simply
-- Always state when information is not found in the provided documents
-
-Important:
-- Base answers ONLY on the provided legal documents
-- If the answer is not in the documents, say so clearly
-- Cite specific articles, sections, and page numbers
-- Use clear, professional language"""
-
-        user_prompt = f"""Based on the following UAE legal documents, please answer this question:
-
-QUESTION: {query}
-
-RELEVANT LEGAL DOCUMENTS:
-{context}
-
-Please provide:
-1. Direct answer to the question
-2. Relevant articles and laws cited
-3. Page references from source documents
-4. Any important context or clarifications
-
-If the answer is not in the provided documents, please state that clearly."""
+        user_prompt = "".join((_USER_PROMPT_HEAD, query, _USER_PROMPT_DOCS, context, _USER_PROMPT_TAIL))
 
         print(f"{Fore.CYAN}Analyzing with Claude...{Style.RESET_ALL}\n")
 
@@ -163,7 +205,7 @@ If the answer is not in the provided documents, please state that clearly."""
         try:
             response = self.claude_client.generate_response(
                 prompt=user_prompt,
-                system_prompt=system_prompt,
+                system_prompt=SYSTEM_PROMPT,
                 max_tokens=2000
             )
 
@@ -206,8 +248,8 @@ If the answer is not in the provided documents, please state that clearly."""
         # Print source documents
         print(f"{Fore.YELLOW}Source Documents:{Style.RESET_ALL}")
         for i, doc in enumerate(results['search_results'], 1):
-            print(f"{i}. {doc['source']}")
-            print(f"   Page {doc['page']}, Relevance: {1 - doc['distance']:.1%}")
+            print(f"{i}. {doc.source}")
+            print(f"   Page {doc.page}, Relevance: {1 - doc.distance:.1%}")
 
         # Print token usage
         if 'tokens_used' in results:
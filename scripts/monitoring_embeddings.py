@@ -4,30 +4,253 @@ Embeddings Usage Monitoring and Cost Tracking Utility
 Monitors OpenAI embeddings API usage, calculates costs, and generates reports.
 """
 
+from __future__ import annotations
+
+import functools
 import json
+import mmap
 import os
+import pickle
+import re
+import sys
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from itertools import compress, islice
+from typing import TYPE_CHECKING, List, Dict, NamedTuple, Optional, Tuple
 import argparse
-from collections import defaultdict
-from tabulate import tabulate
 from colorama import Fore, Style, init
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # Optional speedup - stdlib json is the fallback
+    orjson = None
+    _json_loads = json.loads
+
+# numpy is imported inside the functions that need it, so '--help', a missing
+# log and the cached whole-history report start without loading it
+if TYPE_CHECKING:
+    import numpy as np
+
+# datetime.fromisoformat() accepts a trailing 'Z' natively since Python 3.11
+_ISO_Z_NATIVE = sys.version_info >= (3, 11)
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Batched embedding calls log many records with the same timestamp string;
+# parse each distinct string once (cleared after every report)
+_parse_ts = functools.lru_cache(maxsize=None)(datetime.fromisoformat)
+
+# ANSI color codes take no space on screen; strip them when measuring cells
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+
 # Constants
 USAGE_LOG_FILE = "logs/embeddings_usage.jsonl"
 PRICING = {
     "text-embedding-3-small": 0.00002,  # per 1K tokens
     "text-embedding-3-large": 0.00013
 }
+# Integer pricing in micro-USD per 1K tokens; tokens * price is then an
+# exact cost in nano-USD (COST_UNITS_PER_USD units), converted only for output
+PRICING_MICROS = {model: round(price * 1_000_000) for model, price in PRICING.items()}
+COST_UNITS_PER_USD = 1_000_000_000
+STATS_CACHE_SUFFIX = ".stats.pkl"  # Sidecar with aggregates of already-scanned lines
+STATS_CACHE_VERSION = 1
+COLOR_TIERS = (Fore.GREEN, Fore.YELLOW, Fore.RED)  # cost < $1, < $10, >= $10
+PARSE_CHUNK_LINES = 4096  # Lines decoded per bulk JSON call
+PERIOD_DAYS = {
+    "day": 1,
+    "week": 7,
+    "month": 30
+}
+
+
+class UsageColumns(NamedTuple):
+    """Columnar view of usage records (one array element per record)."""
+    tokens: np.ndarray  # int64 token counts
+    costs: np.ndarray  # int64 cost in nano-USD (see COST_UNITS_PER_USD)
+    models: np.ndarray  # model names, '' when missing
+    dates: np.ndarray  # 'YYYY-MM-DD' strings, '' when timestamp is missing
+    timestamps: np.ndarray  # datetime64[us], NaT when timestamp is missing
+    raw_timestamps: np.ndarray  # object: timestamp values as stored in the records
+    durations: np.ndarray  # object: duration_ms values as stored in the records
+    has_model: np.ndarray  # bool: record has a 'model' key ('unknown' in stats otherwise)
+
+    def select(self, mask: np.ndarray) -> "UsageColumns":
+        """Vráti stĺpce iba pre záznamy vybrané maskou."""
+        return UsageColumns(*(column[mask] for column in self))
+
+
+def build_columns(records: List[Dict]) -> UsageColumns:
+    """
+    Extrahuje stĺpce z usage records (jeden prechod cez záznamy).
+
+    This is the only traversal of the record dicts per report; stats,
+    daily breakdown and CSV export all work from the returned columns.
+
+    Args:
+        records: List of usage records
+
+    Returns:
+        UsageColumns with one array element per record
+    """
+    import numpy as np
+
+    fields = [
+        (int(r.get('tokens') or 0), r.get('model', ''), r.get('timestamp', ''), r.get('duration_ms', 0),
+         'model' in r)
+        for r in records
+    ]
+    tokens, models, raw_timestamps, durations, has_model = zip(*fields) if fields else ((),) * 5
+
+    tokens = np.array(tokens, dtype=np.int64)
+    # Price lookups happen once per distinct model, then fan out by index
+    models = np.array(models, dtype=str)
+    unique_models, model_idx = np.unique(models, return_inverse=True)
+    price_table = np.array([PRICING_MICROS.get(m, 0) for m in unique_models.tolist()], dtype=np.int64)
+    costs = tokens * price_table[model_idx]
+
+    timestamps = _datetime64_column(raw_timestamps)
+    dates = np.where(np.isnat(timestamps), '', np.datetime_as_string(timestamps, unit='D'))
+
+    return UsageColumns(
+        tokens, costs, models, dates, timestamps,
+        np.array(raw_timestamps, dtype=object), np.array(durations, dtype=object),
+        np.array(has_model, dtype=bool)
+    )
+
+
+def _datetime64_column(values) -> np.ndarray:
+    """
+    Prevedie timestampy záznamov na datetime64[us] stĺpec (NaT ak chýba).
+
+    Naive datetimes are converted through integer microseconds since the
+    epoch, several times faster than letting NumPy convert datetime
+    objects one by one. Other values (timezone-aware datetimes, ISO
+    strings) take NumPy's generic conversion.
+
+    Args:
+        values: Timestamp values as stored in the records
+
+    Returns:
+        datetime64[us] array
+    """
+    import numpy as np
+
+    nat = np.iinfo(np.int64).min
+    try:
+        micros = np.fromiter(
+            ((ts - _EPOCH) // _MICROSECOND if ts else nat for ts in values),
+            dtype=np.int64, count=len(values)
+        )
+        return micros.view('datetime64[us]')
+    except TypeError:
+        pass
+
+    # Timezone-aware values keep their wall-clock time (as strftime did)
+    return np.array(
+        [ts.replace(tzinfo=None) if isinstance(ts, datetime) else ts or None for ts in values],
+        dtype='datetime64[us]'
+    )
+
+
+def _iter_lines(buf, start: int = 0, end: Optional[int] = None):
+    """
+    Iteruje riadky bufferu (bytes/mmap) bez vytvorenia celého zoznamu.
+
+    Args:
+        buf: Buffer supporting find() and slicing
+        start: Offset to start at (must be at a line start)
+        end: Offset to stop at (defaults to the end of the buffer)
+
+    Yields:
+        Each line as bytes, without the trailing newline
+    """
+    pos = start
+    size = len(buf) if end is None else end
+    while pos < size:
+        line_end = buf.find(b"\n", pos, size)
+        if line_end == -1:
+            line_end = size
+        yield buf[pos:line_end]
+        pos = line_end + 1
+
+
+def _parse_records(lines):
+    """
+    Parsuje JSON riadky po dávkach (jedno volanie parsera na dávku).
+
+    Each chunk of lines is joined into a single JSON array and decoded at
+    once. If that fails or does not yield one object per line (corrupt
+    lines), the chunk is re-parsed line by line and bad lines are skipped.
+
+    Args:
+        lines: Iterable of raw JSONL lines (bytes)
+
+    Yields:
+        Decoded records
+    """
+    lines = (line for line in lines if line.strip())
+    while True:
+        chunk = list(islice(lines, PARSE_CHUNK_LINES))
+        if not chunk:
+            return
+        try:
+            parsed = _json_loads(b"[" + b",".join(chunk) + b"]")
+        except ValueError:  # JSONDecodeError, or UnicodeDecodeError on invalid UTF-8
+            parsed = None
+        if parsed is not None and len(parsed) == len(chunk) and all(type(r) is dict for r in parsed):
+            yield from parsed
+            continue
+        for line in chunk:
+            try:
+                yield _json_loads(line)
+            except ValueError:  # JSON and UTF-8 decode errors (orjson's included)
+                # Skip corrupt lines
+                continue
+
+
+def _to_datetime(ts: str) -> datetime:
+    """Prevedie ISO-8601 timestamp z logu na datetime."""
+    if not _ISO_Z_NATIVE:
+        ts = ts.replace('Z', '+00:00')
+    return _parse_ts(ts)
 
 
-def read_usage_logs(log_file: str = USAGE_LOG_FILE) -> List[Dict]:
+def _read_records(buf, start: int, end: int, min_iso: Optional[str] = None) -> List[Dict]:
+    """
+    Parsuje záznamy z bajtového rozsahu bufferu.
+
+    Args:
+        buf: Log contents (bytes/mmap)
+        start: Offset of the first line to parse
+        end: Offset after the last byte to parse
+        min_iso: Optional ISO-8601 cutoff (see read_usage_logs)
+
+    Returns:
+        List of usage record dictionaries
+    """
+    records = []
+    for record in _parse_records(_iter_lines(buf, start, end)):
+        # Convert timestamp string to datetime
+        if 'timestamp' in record:
+            ts = record['timestamp']
+            if min_iso and ts < min_iso:
+                continue
+            record['timestamp'] = _to_datetime(ts)
+        records.append(record)
+    return records
+
+
+def read_usage_logs(log_file: str = USAGE_LOG_FILE, min_iso: Optional[str] = None) -> List[Dict]:
     """
     Načíta usage logs zo JSONL súboru.
     
     Args:
         log_file: Path to the JSONL log file
+        min_iso: Optional ISO-8601 cutoff; older records are dropped before
+            their timestamp is parsed (ISO strings sort lexicographically)
         
     Returns:
         List of usage record dictionaries
@@ -35,68 +258,234 @@ def read_usage_logs(log_file: str = USAGE_LOG_FILE) -> List[Dict]:
     if not os.path.exists(log_file):
         return []
     
-    records = []
     try:
-        with open(log_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                try:
-                    record = json.loads(line.strip())
-                    # Convert timestamp string to datetime
-                    if 'timestamp' in record:
-                        record['timestamp'] = datetime.fromisoformat(
-                            record['timestamp'].replace('Z', '+00:00')
-                        )
-                    records.append(record)
-                except json.JSONDecodeError:
-                    # Skip corrupt lines
-                    continue
+        with open(log_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
     except Exception as e:
         print(f"Error reading log file: {e}")
         return []
+
+    with data:
+        return _read_records(data, 0, len(data), min_iso)
+
+
+def _empty_aggregates(inode: int) -> Dict:
+    """Prázdne agregáty pre stats cache."""
+    return {
+        "version": STATS_CACHE_VERSION,
+        "inode": inode,
+        "offset": 0,
+        "groups": {},  # (date, model) -> [calls, tokens]; date '' if no timestamp
+        "models": set(),
+        "first": None,
+        "last": None
+    }
+
+
+def _merge_records(aggregates: Dict, records):
+    """
+    Pripočíta záznamy k agregátom (calls a tokens sú celé čísla, bez FP driftu).
+
+    The day key is sliced from the raw ISO timestamp ('YYYY-MM-DD...'),
+    so datetimes are only built to track the first and last call.
+
+    Args:
+        aggregates: Aggregates dict to update in place
+        records: Newly decoded usage records (timestamps still as strings)
+    """
+    groups = aggregates["groups"]
+    models = aggregates["models"]
+    first = aggregates["first"]
+    last = aggregates["last"]
+    for r in records:
+        raw_ts = r.get('timestamp')
+        day = ''
+        if raw_ts:
+            ts = _to_datetime(raw_ts)
+            if first is None or ts < first:
+                first = ts
+            if last is None or ts > last:
+                last = ts
+            # Basic-format timestamps (no dashes) fall back to strftime
+            day = raw_ts[:10] if raw_ts[4:5] == '-' else ts.strftime('%Y-%m-%d')
+        key = (day, r.get('model', ''))
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = [0, 0]
+        group[0] += 1
+        group[1] += int(r.get('tokens') or 0)
+        models.add(r.get('model', 'unknown'))
+    aggregates["first"] = first
+    aggregates["last"] = last
+
+
+def load_usage_aggregates(log_file: str = USAGE_LOG_FILE) -> Optional[Dict]:
+    """
+    Načíta agregáty celej histórie, inkrementálne cez sidecar cache.
+
+    Only lines appended since the last run are parsed. The cache is keyed
+    by the file's inode and the offset of the last complete line, and is
+    rebuilt when the log is rotated or truncated.
+
+    Args:
+        log_file: Path to the JSONL log file
+
+    Returns:
+        Aggregates dict, or None if the log file does not exist
+    """
+    if not os.path.exists(log_file):
+        return None
+
+    cache_file = log_file + STATS_CACHE_SUFFIX
+    st = os.stat(log_file)
+
+    aggregates = None
+    try:
+        with open(cache_file, 'rb') as f:
+            aggregates = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        pass
+    if (
+        not isinstance(aggregates, dict)
+        or aggregates.get("version") != STATS_CACHE_VERSION
+        or aggregates.get("inode") != st.st_ino
+        or aggregates.get("offset", 0) > st.st_size
+    ):
+        aggregates = _empty_aggregates(st.st_ino)
+
+    start = aggregates["offset"]
+    if st.st_size > start:
+        try:
+            with open(log_file, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception as e:
+            print(f"Error reading log file: {e}")
+            return None
+
+        with data:
+            # Stop at the last newline so a half-written line is re-read next run
+            end = data.rfind(b"\n", start) + 1
+            if end > start:
+                _merge_records(aggregates, _parse_records(_iter_lines(data, start, end)))
+                aggregates["offset"] = end
+
+        try:
+            with open(cache_file, 'wb') as f:
+                pickle.dump(aggregates, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            pass  # Cache is an optimization only
+
+    return aggregates
+
+
+def stats_from_aggregates(aggregates: Dict) -> Tuple[Dict, Dict[str, Dict]]:
+    """
+    Vypočíta celkové a denné štatistiky z agregátov.
+
+    Args:
+        aggregates: Aggregates from load_usage_aggregates
+
+    Returns:
+        Tuple (stats, daily_stats) in the same format as calculate_stats
+        and calculate_daily_stats
+    """
+    total_calls = 0
+    total_tokens = 0
+    total_cost = 0
+    daily = {}
+    for (date, model), (calls, tokens) in aggregates["groups"].items():
+        cost = tokens * PRICING_MICROS.get(model, 0)
+        total_calls += calls
+        total_tokens += tokens
+        total_cost += cost
+        if date:
+            day = daily.setdefault(date, [0, 0, 0])
+            day[0] += calls
+            day[1] += tokens
+            day[2] += cost
+
+    oldest = aggregates["first"]
+    newest = aggregates["last"]
+    duration_hours = 0.0
+    if oldest and newest:
+        duration_hours = (newest - oldest).total_seconds() / 3600
+
+    stats = {
+        "total_calls": total_calls,
+        "total_tokens": total_tokens,
+        "estimated_cost_usd": total_cost / COST_UNITS_PER_USD,
+        "models_used": list(aggregates["models"]),
+        "period_start": oldest,
+        "period_end": newest,
+        "duration_hours": duration_hours,
+        "avg_tokens_per_call": total_tokens / total_calls if total_calls > 0 else 0.0
+    }
+    daily_stats = {
+        date: {"calls": calls, "tokens": tokens, "cost": cost / COST_UNITS_PER_USD}
+        for date, (calls, tokens, cost) in sorted(daily.items())
+    }
+    return stats, daily_stats
+
+
+def period_mask(timestamps: np.ndarray, period: str) -> Optional[np.ndarray]:
+    """
+    Vypočíta masku záznamov patriacich do obdobia (jedno vektorové porovnanie).
     
-    return records
+    Args:
+        timestamps: datetime64 timestamp column (NaT when missing)
+        period: Time period filter (day/week/month/all)
+        
+    Returns:
+        Boolean mask, or None when the period keeps every record
+    """
+    if period not in PERIOD_DAYS:
+        return None
+
+    import numpy as np
+
+    cutoff = np.datetime64(datetime.now() - timedelta(days=PERIOD_DAYS[period]), 'us')
+    
+    # Keep records where timestamp >= cutoff; records without one are kept
+    return (timestamps >= cutoff) | np.isnat(timestamps)
 
 
-def filter_by_period(records: List[Dict], period: str) -> List[Dict]:
+def filter_by_period(records: List[Dict], period: str, columns: Optional[UsageColumns] = None) -> List[Dict]:
     """
     Filtruje záznamy podľa obdobia (day/week/month/all).
     
     Args:
         records: List of usage records
         period: Time period filter (day/week/month/all)
+        columns: Precomputed columns for records (built if not given)
         
     Returns:
         Filtered list of records
     """
-    if period == "all":
-        return records
-    
-    now = datetime.now()
-    
-    if period == "day":
-        cutoff = now - timedelta(days=1)
-    elif period == "week":
-        cutoff = now - timedelta(days=7)
-    elif period == "month":
-        cutoff = now - timedelta(days=30)
-    else:
+    if period not in PERIOD_DAYS:
         return records
+
+    if columns is None:
+        columns = build_columns(records)
     
-    # Filter records where timestamp >= cutoff
-    filtered = [r for r in records if r.get('timestamp', now) >= cutoff]
-    return filtered
+    mask = period_mask(columns.timestamps, period)
+    return list(compress(records, mask.tolist()))
 
 
-def calculate_stats(records: List[Dict]) -> Dict:
+def calculate_stats(records: List[Dict], columns: Optional[UsageColumns] = None) -> Dict:
     """
     Vypočíta štatistiky z usage records.
     
     Args:
         records: List of usage records
+        columns: Precomputed columns for records (built if not given)
         
     Returns:
         Dictionary with calculated statistics
     """
+    import numpy as np
+
     if not records:
         return {
             "total_calls": 0,
@@ -109,22 +498,23 @@ def calculate_stats(records: List[Dict]) -> Dict:
             "avg_tokens_per_call": 0.0
         }
     
+    if columns is None:
+        columns = build_columns(records)
+
     total_calls = len(records)
-    total_tokens = sum([r.get('tokens', 0) for r in records])
-    models = set([r.get('model', 'unknown') for r in records])
-    
-    # Calculate estimated cost
-    estimated_cost = 0.0
-    for record in records:
-        tokens = record.get('tokens', 0)
-        model = record.get('model', '')
-        cost_per_1k = PRICING.get(model, 0)
-        estimated_cost += (tokens / 1000) * cost_per_1k
-    
-    # Get timestamps
-    timestamps = [r.get('timestamp') for r in records if r.get('timestamp')]
-    oldest = min(timestamps) if timestamps else None
-    newest = max(timestamps) if timestamps else None
+    total_tokens = int(columns.tokens.sum())
+    models = {
+        model if has_model else 'unknown'
+        for model, has_model in zip(columns.models.tolist(), columns.has_model.tolist())
+    }
+
+    # Calculate estimated cost (exact integer sum, converted to USD once)
+    estimated_cost = int(columns.costs.sum()) / COST_UNITS_PER_USD
+
+    # Get timestamps (min and max over the contiguous datetime64 column)
+    timestamps = columns.timestamps[~np.isnat(columns.timestamps)]
+    oldest = timestamps.min().item() if timestamps.size else None
+    newest = timestamps.max().item() if timestamps.size else None
     
     # Calculate duration
     duration_hours = 0.0
@@ -147,36 +537,78 @@ def calculate_stats(records: List[Dict]) -> Dict:
     }
 
 
-def calculate_daily_stats(records: List[Dict]) -> Dict[str, Dict]:
+def calculate_daily_stats(records: List[Dict], columns: Optional[UsageColumns] = None) -> Dict[str, Dict]:
     """
     Zoskupí usage podľa dní.
     
     Args:
         records: List of usage records
+        columns: Precomputed columns for records (built if not given)
         
     Returns:
         Dictionary with daily statistics
     """
-    daily_data = defaultdict(lambda: {"calls": 0, "tokens": 0, "cost": 0.0})
-    
-    for record in records:
-        timestamp = record.get('timestamp')
-        if not timestamp:
-            continue
-        
-        date_key = timestamp.strftime('%Y-%m-%d')
-        tokens = record.get('tokens', 0)
-        model = record.get('model', '')
-        cost_per_1k = PRICING.get(model, 0)
-        cost = (tokens / 1000) * cost_per_1k
-        
-        daily_data[date_key]["calls"] += 1
-        daily_data[date_key]["tokens"] += tokens
-        daily_data[date_key]["cost"] += cost
-    
-    # Sort by date
-    sorted_data = dict(sorted(daily_data.items()))
-    return sorted_data
+    import numpy as np
+
+    if columns is None:
+        columns = build_columns(records)
+
+    has_date = columns.dates != ''
+    if not has_date.any():
+        return {}
+
+    # Group by day: sort by date, then sum each run of equal dates in int64
+    dates = columns.dates[has_date]
+    order = np.argsort(dates, kind='stable')
+    dates = dates[order]
+    starts = np.flatnonzero(np.concatenate(([True], dates[1:] != dates[:-1])))
+
+    calls_per_day = np.diff(np.append(starts, len(dates)))
+    tokens_per_day = np.add.reduceat(columns.tokens[has_date][order], starts)
+    cost_per_day = np.add.reduceat(columns.costs[has_date][order], starts)
+
+    return {
+        date: {"calls": calls, "tokens": day_tokens, "cost": cost / COST_UNITS_PER_USD}
+        for date, calls, day_tokens, cost in zip(
+            dates[starts].tolist(), calls_per_day.tolist(), tokens_per_day.tolist(), cost_per_day.tolist()
+        )
+    }
+
+
+def _grid_table(headers: List[str], rows: List[List[str]], numeric: Tuple[int, ...] = ()) -> str:
+    """
+    Naformátuje tabuľku v 'grid' štýle.
+
+    Args:
+        headers: Column headers
+        rows: Table rows (cells may contain ANSI color codes)
+        numeric: Indexes of right-aligned (numeric) columns
+
+    Returns:
+        Table as a multi-line string
+    """
+    # Header gets two spaces of breathing room, as in tabulate's grid format
+    widths = [
+        max(len(header) + 2, *(len(_ANSI_RE.sub('', cell)) for cell in column))
+        for header, column in zip(headers, zip(*rows))
+    ]
+
+    def line(fill: str) -> str:
+        return "+" + "+".join(fill * (width + 2) for width in widths) + "+"
+
+    def row(cells: List[str]) -> str:
+        padded = []
+        for i, (cell, width) in enumerate(zip(cells, widths)):
+            pad = " " * (width - len(_ANSI_RE.sub('', cell)))
+            padded.append(pad + cell if i in numeric else cell + pad)
+        return "| " + " | ".join(padded) + " |"
+
+    separator = line("-")
+    parts = [separator, row(headers), line("=")]
+    for cells in rows:
+        parts.append(row(cells))
+        parts.append(separator)
+    return "\n".join(parts)
 
 
 def print_summary_table(stats: Dict):
@@ -192,12 +624,7 @@ def print_summary_table(stats: Dict):
     
     # Determine color based on cost
     cost = stats['estimated_cost_usd']
-    if cost < 1:
-        cost_color = Fore.GREEN
-    elif cost < 10:
-        cost_color = Fore.YELLOW
-    else:
-        cost_color = Fore.RED
+    cost_color = COLOR_TIERS[(cost >= 1) + (cost >= 10)]
     
     # Format period
     period_str = "N/A"
@@ -214,7 +641,7 @@ def print_summary_table(stats: Dict):
         ["Duration", f"{stats['duration_hours']:.1f} hours"]
     ]
     
-    print(tabulate(table_data, headers=["Metric", "Value"], tablefmt="grid"))
+    print(_grid_table(["Metric", "Value"], table_data))
     print()
 
 
@@ -241,7 +668,7 @@ def print_daily_breakdown(daily_stats: Dict):
             date,
             f"{data['calls']:,}",
             f"{data['tokens']:,}",
-            f"${data['cost']:.4f}"
+            f"{COLOR_TIERS[(data['cost'] >= 1) + (data['cost'] >= 10)]}${data['cost']:.4f}{Style.RESET_ALL}"
         ])
         total_calls += data['calls']
         total_tokens += data['tokens']
@@ -255,7 +682,7 @@ def print_daily_breakdown(daily_stats: Dict):
         f"{Fore.CYAN}${total_cost:.4f}{Style.RESET_ALL}"
     ])
     
-    print(tabulate(table_data, headers=["Date", "Calls", "Tokens", "Cost ($)"], tablefmt="grid"))
+    print(_grid_table(["Date", "Calls", "Tokens", "Cost ($)"], table_data, numeric=(1, 2)))
     print()
 
 
@@ -276,33 +703,40 @@ def check_cost_alerts(stats: Dict, threshold_usd: float = 1.0) -> Optional[str]:
     return None
 
 
-def export_to_csv(records: List[Dict], output_file: str):
+def export_to_csv(records: List[Dict], output_file: str, columns: Optional[UsageColumns] = None):
     """
     Exportuje usage data do CSV.
     
     Args:
         records: List of usage records
         output_file: Output CSV file path
+        columns: Optional precomputed columns (built from records if omitted)
     """
     import csv
+    import numpy as np
+    
+    if columns is None:
+        columns = build_columns(records)
     
     try:
+        # Costs are rounded (half up) to whole micro-USD and formatted for
+        # all rows at once, without a round trip through float
+        micros = (columns.costs + 500) // 1000
+        costs = np.char.add(
+            np.char.mod('%d.', micros // 1_000_000), np.char.mod('%06d', micros % 1_000_000)
+        )
+        timestamps = (
+            ts.isoformat() if isinstance(ts, datetime) else ts
+            for ts in columns.raw_timestamps.tolist()
+        )
+        
         with open(output_file, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
             writer.writerow(['timestamp', 'model', 'tokens', 'cost', 'duration_ms'])
-            
-            for record in records:
-                timestamp = record.get('timestamp', '')
-                if isinstance(timestamp, datetime):
-                    timestamp = timestamp.isoformat()
-                
-                model = record.get('model', '')
-                tokens = record.get('tokens', 0)
-                cost_per_1k = PRICING.get(model, 0)
-                cost = (tokens / 1000) * cost_per_1k
-                duration_ms = record.get('duration_ms', 0)
-                
-                writer.writerow([timestamp, model, tokens, f"{cost:.6f}", duration_ms])
+            writer.writerows(zip(
+                timestamps, columns.models.tolist(), columns.tokens.tolist(),
+                costs.tolist(), columns.durations.tolist()
+            ))
         
         print(f"{Fore.GREEN}✓ Successfully exported {len(records)} records to {output_file}{Style.RESET_ALL}")
     except Exception as e:
@@ -318,23 +752,46 @@ def generate_report(period: str = "day", alert_threshold: float = 1.0, export_cs
         alert_threshold: Cost threshold for alerts in USD
         export_csv: Optional CSV export file path
     """
-    # Load records
-    records = read_usage_logs()
-    
-    if not records:
-        print(f"{Fore.YELLOW}No usage data found in {USAGE_LOG_FILE}{Style.RESET_ALL}")
-        return
-    
-    # Filter by period
-    filtered_records = filter_by_period(records, period)
-    
-    if not filtered_records:
-        print(f"{Fore.YELLOW}No usage data found for period: {period}{Style.RESET_ALL}")
-        return
-    
-    # Calculate statistics
-    stats = calculate_stats(filtered_records)
-    daily_stats = calculate_daily_stats(filtered_records)
+    if period == "all" and not export_csv:
+        # Whole-history report without export needs only the cached aggregates
+        aggregates = load_usage_aggregates()
+        _parse_ts.cache_clear()
+        
+        if not aggregates or not aggregates["groups"]:
+            print(f"{Fore.YELLOW}No usage data found in {USAGE_LOG_FILE}{Style.RESET_ALL}")
+            return
+        
+        stats, daily_stats = stats_from_aggregates(aggregates)
+    else:
+        # Load records; a period cutoff lets the reader skip old lines early
+        min_iso = None
+        if period in PERIOD_DAYS:
+            min_iso = (datetime.now() - timedelta(days=PERIOD_DAYS[period])).isoformat()
+        records = read_usage_logs(min_iso=min_iso)
+        _parse_ts.cache_clear()  # Parsed datetimes live on in the records
+        
+        if not records:
+            if min_iso and os.path.exists(USAGE_LOG_FILE):
+                print(f"{Fore.YELLOW}No usage data found for period: {period}{Style.RESET_ALL}")
+            else:
+                print(f"{Fore.YELLOW}No usage data found in {USAGE_LOG_FILE}{Style.RESET_ALL}")
+            return
+        
+        # Filter by period (columns are extracted once and shared)
+        columns = build_columns(records)
+        filtered_records = records
+        mask = period_mask(columns.timestamps, period)
+        if mask is not None:
+            filtered_records = list(compress(records, mask.tolist()))
+            columns = columns.select(mask)
+        
+        if not filtered_records:
+            print(f"{Fore.YELLOW}No usage data found for period: {period}{Style.RESET_ALL}")
+            return
+        
+        # Calculate statistics
+        stats = calculate_stats(filtered_records, columns)
+        daily_stats = calculate_daily_stats(filtered_records, columns)
     
     # Print reports
     print_summary_table(stats)
@@ -347,7 +804,7 @@ def generate_report(period: str = "day", alert_threshold: float = 1.0, export_cs
     
     # Export to CSV if requested
     if export_csv:
-        export_to_csv(filtered_records, export_csv)
+        export_to_csv(filtered_records, export_csv, columns)
     
     # Print recommendations
     print(f"\n{Fore.CYAN}RECOMMENDATIONS{Style.RESET_ALL}")
@@ -2,32 +2,33 @@
 UAE Legal Agent - GitHub Documentation Generator
 Vytvorí všetky potrebné dokumentačné súbory pre GitHub
 """
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 
 
-def create_github_docs():
-    """Vytvorí kompletné GitHub dokumenty"""
-
-    print("=" * 70)
-    print("📚 UAE Legal Agent - GitHub Documentation Generator")
-    print("=" * 70)
-    print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-
-    base_dir = Path(".")
-    docs_dir = base_dir / "docs"
-    sessions_dir = docs_dir / "sessions"
-
-    # Ensure directories exist
-    sessions_dir.mkdir(parents=True, exist_ok=True)
+# Repository coordinates - one place to change owner, name or branch
+OWNER = "rauschiccsk"
+REPO = "uae-legal-agent"
+BRANCH = "main"
+# Raw URLs point at GIT_SHA when set (e.g. by CI): a commit-pinned URL is
+# immutable and caches well, unlike the short-TTL branch URL
+REF = os.environ.get("GIT_SHA") or BRANCH
+REPO_URL = f"https://github.com/{OWNER}/{REPO}"
+RAW = f"https://raw.githubusercontent.com/{OWNER}/{REPO}/{REF}"
 
-    # ==================== INIT_CONTEXT.md ====================
-    print("📝 Creating INIT_CONTEXT.md...")
-
-    init_context = """# UAE Legal Agent - Project Context
+# Markdown template sources (compiled once below): {ts} = run timestamp,
+# {raw} = raw file URL prefix, {repo_url} = repository URL
+# docs/INIT_CONTEXT.md template
+_INIT_CONTEXT_MD = """# UAE Legal Agent - Project Context
 
 **Project:** UAE Legal Agent  
-**Repository:** https://github.com/rauschiccsk/uae-legal-agent  
+**Repository:** {repo_url}  
 **Created:** 2025-10-25  
 **Author:** Zoltán Rauscher  
 **Company:** ICC Komárno  
@@ -161,8 +162,8 @@ MAX_TOKENS=8000                          # Max response tokens
 ### GitHub-Based Context Loading
 Single-URL loading pattern pre Claude conversations:
 ```
-https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/INIT_CONTEXT.md
-https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/project_file_access.json
+{raw}/docs/INIT_CONTEXT.md
+{raw}/docs/project_file_access.json
 ```
 
 ### Session Documentation
@@ -175,7 +176,7 @@ https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/project_
 
 ### 1. Clone Repository
 ```bash
-git clone https://github.com/rauschiccsk/uae-legal-agent.git
+git clone {repo_url}.git
 cd uae-legal-agent
 ```
 
@@ -200,8 +201,8 @@ python tests/test_claude_api.py
 ### 5. Load Project Context
 ```
 Paste these URLs to Claude:
-https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/INIT_CONTEXT.md
-https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/project_file_access.json
+{raw}/docs/INIT_CONTEXT.md
+{raw}/docs/project_file_access.json
 ```
 
 ## 💡 Next Steps
@@ -221,57 +222,52 @@ https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/project_
 
 ---
 
-**Last Updated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+**Last Updated:** {ts}
 """
 
-    with open(docs_dir / "INIT_CONTEXT.md", "w", encoding="utf-8") as f:
-        f.write(init_context)
-    print("✅ INIT_CONTEXT.md created")
-
-    # ==================== project_file_access.json ====================
-    print("📝 Creating project_file_access.json...")
-
-    project_files = """{
-  "project": "uae-legal-agent",
-  "repository": "https://github.com/rauschiccsk/uae-legal-agent",
-  "description": "AI-powered legal analysis system for UAE law",
-  "files": {
+# Repository paths listed in docs/project_file_access.json, by category
+FILES = {
     "documentation": {
-      "init_context": "https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/INIT_CONTEXT.md",
-      "readme": "https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/README.md",
-      "latest_session": "https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/sessions/2025-10-25_session.md"
+        "init_context": "docs/INIT_CONTEXT.md",
+        "readme": "README.md",
+        "latest_session": "docs/sessions/2025-10-25_session.md"
     },
     "source_code": {
-      "claude_client": "https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/src/core/claude_client.py",
-      "config": "https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/src/core/config.py",
-      "api_main": "https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/src/api/main.py"
+        "claude_client": "src/core/claude_client.py",
+        "config": "src/core/config.py",
+        "api_main": "src/api/main.py"
     },
     "tests": {
-      "api_test": "https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/tests/test_claude_api.py"
+        "api_test": "tests/test_claude_api.py"
     },
     "configuration": {
-      "requirements_minimal": "https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/requirements-minimal.txt",
-      "requirements_ultraminimal": "https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/requirements-ultraminimal.txt",
-      "env_example": "https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/.env.example"
+        "requirements_minimal": "requirements-minimal.txt",
+        "requirements_ultraminimal": "requirements-ultraminimal.txt",
+        "env_example": ".env.example"
     }
-  },
-  "quick_load": {
-    "description": "Paste these two URLs to Claude for full project context",
-    "urls": [
-      "https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/INIT_CONTEXT.md",
-      "https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/project_file_access.json"
-    ]
-  }
-}"""
-
-    with open(docs_dir / "project_file_access.json", "w", encoding="utf-8") as f:
-        f.write(project_files)
-    print("✅ project_file_access.json created")
-
-    # ==================== SESSION NOTE ====================
-    print("📝 Creating session note...")
+}
+
+# docs/project_file_access.json (serialized with json.dumps)
+_PROJECT_FILES = {
+    "project": REPO,
+    "repository": REPO_URL,
+    "description": "AI-powered legal analysis system for UAE law",
+    "files": {
+        category: {key: f"{RAW}/{path}" for key, path in entries.items()}
+        for category, entries in FILES.items()
+    },
+    "quick_load": {
+        "description": "Paste these URLs to Claude for full project context "
+                       "(BUNDLE.md = INIT_CONTEXT.md + GITHUB_SETUP.md in one fetch)",
+        "urls": [
+            f"{RAW}/docs/BUNDLE.md",
+            f"{RAW}/docs/project_file_access.json"
+        ]
+    }
+}
 
-    session_note = f"""# UAE Legal Agent - Development Session
+# docs/sessions/2025-10-25_session.md template
+_SESSION_NOTE_MD = """# UAE Legal Agent - Development Session
 **Date:** 2025-10-25  
 **Session:** Initial Setup & Claude API Integration  
 **Duration:** ~2 hours  
@@ -466,19 +462,13 @@ pip install anthropic python-dotenv pydantic pydantic-settings
 
 ---
 
-**Session End:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
+**Session End:** {ts}  
 **Status:** ✅ Setup Complete, Ready for Development  
 **Next Session:** Legal Analysis Prototype
 """
 
-    with open(sessions_dir / "2025-10-25_session.md", "w", encoding="utf-8") as f:
-        f.write(session_note)
-    print("✅ 2025-10-25_session.md created")
-
-    # ==================== GITHUB SETUP GUIDE ====================
-    print("📝 Creating GitHub setup guide...")
-
-    github_guide = """# GitHub Repository Setup Guide
+# docs/GITHUB_SETUP.md template
+_GITHUB_GUIDE_MD = """# GitHub Repository Setup Guide
 
 ## 🎯 Quick Setup
 
@@ -512,7 +502,7 @@ git add .
 git commit -m "Initial commit: UAE Legal Agent setup with Claude API integration"
 
 # Add remote (replace 'rauschiccsk' with your GitHub username)
-git remote add origin https://github.com/rauschiccsk/uae-legal-agent.git
+git remote add origin {repo_url}.git
 
 # Push to GitHub
 git push -u origin main
@@ -520,7 +510,7 @@ git push -u origin main
 
 ### 3. Verify Upload
 
-Go to: https://github.com/rauschiccsk/uae-legal-agent
+Go to: {repo_url}
 
 You should see:
 - ✅ All files uploaded
@@ -533,8 +523,8 @@ You should see:
 Try loading project in new Claude conversation:
 
 ```
-https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/INIT_CONTEXT.md
-https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/project_file_access.json
+{raw}/docs/INIT_CONTEXT.md
+{raw}/docs/project_file_access.json
 ```
 
 ## 🔒 Security Checklist
@@ -558,13 +548,13 @@ Before pushing, verify:
 After push, your URLs will be:
 
 **Documentation:**
-- INIT_CONTEXT: `https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/INIT_CONTEXT.md`
-- File Access: `https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/project_file_access.json`
-- Latest Session: `https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/sessions/2025-10-25_session.md`
+- INIT_CONTEXT: `{raw}/docs/INIT_CONTEXT.md`
+- File Access: `{raw}/docs/project_file_access.json`
+- Latest Session: `{raw}/docs/sessions/2025-10-25_session.md`
 
 **Source Code:**
-- Claude Client: `https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/src/core/claude_client.py`
-- Config: `https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/src/core/config.py`
+- Claude Client: `{raw}/src/core/claude_client.py`
+- Config: `{raw}/src/core/config.py`
 
 ## ✅ Success Criteria
 
@@ -582,34 +572,212 @@ Your setup is complete when:
 Happy coding! 🚀
 """
 
-    with open(docs_dir / "GITHUB_SETUP.md", "w", encoding="utf-8") as f:
-        f.write(github_guide)
-    print("✅ GITHUB_SETUP.md created")
 
-    # ==================== SUMMARY ====================
-    print("\n" + "=" * 70)
-    print("✅ GITHUB DOCUMENTATION COMPLETE!")
+def _compile(source: str) -> tuple:
+    """Skompiluje šablónu raz pri importe
+
+    Constant fields (URLs) are substituted immediately; the result is split
+    around {ts}, so rendering is a single str.join with no format parsing.
+    """
+    return tuple(source.format(ts="\0", raw=RAW, repo_url=REPO_URL).split("\0"))
+
+
+def _render(template: tuple, ts: str) -> str:
+    """Vyrenderuje skompilovanú šablónu s daným timestampom"""
+    return ts.join(template)
+
+
+_INIT_CONTEXT_TMPL = _compile(_INIT_CONTEXT_MD)
+_SESSION_NOTE_TMPL = _compile(_SESSION_NOTE_MD)
+_GITHUB_GUIDE_TMPL = _compile(_GITHUB_GUIDE_MD)
+
+# docs/BUNDLE.md = INIT_CONTEXT.md + separator + GITHUB_SETUP.md
+_BUNDLE_SEP = "\n\n---\n\n"
+
+
+# O_BINARY exists only on Windows (disables newline translation there)
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _fast_write(path: Path, data: bytes):
+    """Zapíše bajty jedným os.write bez Python buffered I/O vrstiev
+
+    Dáta idú najprv do dočasného súboru vedľa cieľa a potom sa atomicky
+    premenujú, takže watcher ani git nikdy neuvidia rozpísaný súbor.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    fd = os.open(os.fspath(tmp), _WRITE_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            # os.write may write less than requested; loop until done
+            view = view[os.write(fd, view):]
+    except BaseException:
+        os.close(fd)
+        os.unlink(tmp)
+        raise
+    os.close(fd)
+    # Atomic on POSIX and Windows: readers see the old or the new file
+    os.replace(tmp, path)
+
+
+def _file_sha256(path: Path) -> Optional[str]:
+    """Vráti SHA-256 (hex) obsahu súboru, alebo None ak súbor nejde prečítať"""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _write_if_changed(path: Path, data: str) -> bool:
+    """Zapíše súbor iba ak sa jeho obsah zmenil (porovnanie SHA-256)
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    # Encode once and write raw bytes: LF newlines on every platform,
+    # matching what git stores and raw.githubusercontent.com serves
+    encoded = data.encode("utf-8")
+    new = hashlib.sha256(encoded).digest()
+    try:
+        if hashlib.sha256(path.read_bytes()).digest() == new:
+            return False
+    except FileNotFoundError:
+        pass
+    _fast_write(path, encoded)
+    return True
+
+
+def _flush(lines: list):
+    """Vypíše nazbierané riadky jedným zápisom na stdout a vyprázdni zoznam"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+    lines.clear()
+
+
+def create_github_docs():
+    """Vytvorí kompletné GitHub dokumenty"""
+
+    # Single timestamp shared by the console header and all generated files
+    now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    print("=" * 70)
+    print("📚 UAE Legal Agent - GitHub Documentation Generator")
     print("=" * 70)
-    print("\n📂 Created files:")
-    print("   ✅ docs/INIT_CONTEXT.md")
-    print("   ✅ docs/project_file_access.json")
-    print("   ✅ docs/sessions/2025-10-25_session.md")
-    print("   ✅ docs/GITHUB_SETUP.md")
+    print(f"Generated: {now_str}\n")
 
-    print("\n🚀 Next steps:")
-    print("   1. Review docs/GITHUB_SETUP.md")
-    print("   2. Create GitHub repository")
-    print("   3. Push initial commit")
-    print("   4. Test context loading URLs")
+    base_dir = Path(".")
+    docs_dir = base_dir / "docs"
+    sessions_dir = docs_dir / "sessions"
+    manifest_path = docs_dir / ".generator_manifest.json"
+    project_files = json.dumps(_PROJECT_FILES, indent=2, ensure_ascii=False)
+
+    # Outputs depend on their templates plus the run timestamp; hashing
+    # them rendered without the timestamp tells whether a template changed
+    plan = {
+        path.as_posix(): hashlib.sha256(content.encode("utf-8")).hexdigest()
+        for path, content in (
+            (docs_dir / "INIT_CONTEXT.md", _render(_INIT_CONTEXT_TMPL, "")),
+            (docs_dir / "project_file_access.json", project_files),
+            (sessions_dir / "2025-10-25_session.md", _render(_SESSION_NOTE_TMPL, "")),
+            (docs_dir / "GITHUB_SETUP.md", _render(_GITHUB_GUIDE_TMPL, "")),
+            (docs_dir / "BUNDLE.md", _BUNDLE_SEP.join((
+                _render(_INIT_CONTEXT_TMPL, ""), _render(_GITHUB_GUIDE_TMPL, "")))),
+        )
+    }
+    # The manifest also keeps the SHA-256 of each output as written, so a
+    # file edited or overwritten since the last run is regenerated too
+    try:
+        manifest = json.loads(manifest_path.read_bytes())
+    except (OSError, ValueError):
+        manifest = {}
+    if isinstance(manifest, dict) and manifest.keys() == plan.keys() and all(
+        isinstance(entry, dict)
+        and entry.get("source") == plan[path]
+        and entry.get("output") == _file_sha256(Path(path))
+        for path, entry in manifest.items()
+    ):
+        print("✅ Up to date - nothing to do\n")
+        return
+
+    # Progress lines are buffered and written in two batches
+    # (before and after the write phase) instead of one console write each
+    log = []
+
+    # Ensure directories exist (a single stat on the common re-run path)
+    if not sessions_dir.is_dir():
+        sessions_dir.mkdir(parents=True, exist_ok=True)
 
-    print("\n🔗 Quick URLs (after GitHub push):")
-    print("   https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/INIT_CONTEXT.md")
-    print("   https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/project_file_access.json")
-    print("\n")
+    # ==================== INIT_CONTEXT.md ====================
+    log.append("📝 Creating INIT_CONTEXT.md...")
+    init_context = _render(_INIT_CONTEXT_TMPL, now_str)
+
+    # ==================== project_file_access.json ====================
+    log.append("📝 Creating project_file_access.json...")
+
+    # ==================== SESSION NOTE ====================
+    log.append("📝 Creating session note...")
+    session_note = _render(_SESSION_NOTE_TMPL, now_str)
+
+    # ==================== GITHUB SETUP GUIDE ====================
+    log.append("📝 Creating GitHub setup guide...")
+    github_guide = _render(_GITHUB_GUIDE_TMPL, now_str)
+
+    # ==================== BUNDLE ====================
+    # Both documents in one file, so loading the context is one HTTP GET
+    log.append("📝 Creating context bundle...")
+    bundle = init_context + _BUNDLE_SEP + github_guide
+
+    _flush(log)
+
+    # ==================== WRITE FILES ====================
+    # Independent files - write them concurrently so the I/O overlaps
+    jobs = [
+        (docs_dir / "INIT_CONTEXT.md", init_context),
+        (docs_dir / "project_file_access.json", project_files),
+        (sessions_dir / "2025-10-25_session.md", session_note),
+        (docs_dir / "GITHUB_SETUP.md", github_guide),
+        (docs_dir / "BUNDLE.md", bundle),
+    ]
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        for (path, _), written in zip(jobs, executor.map(lambda job: _write_if_changed(*job), jobs)):
+            if written:
+                log.append(f"✅ {path.name} created")
+            else:
+                log.append(f"⏭  {path.name} unchanged")
+    manifest = {
+        path.as_posix(): {
+            "source": plan[path.as_posix()],
+            "output": hashlib.sha256(content.encode("utf-8")).hexdigest()
+        }
+        for path, content in jobs
+    }
+    _write_if_changed(manifest_path, json.dumps(manifest, indent=2) + "\n")
+
+    # ==================== SUMMARY ====================
+    log.append("\n" + "=" * 70)
+    log.append("✅ GITHUB DOCUMENTATION COMPLETE!")
+    log.append("=" * 70)
+    log.append("\n📂 Created files:")
+    log.append("   ✅ docs/INIT_CONTEXT.md")
+    log.append("   ✅ docs/project_file_access.json")
+    log.append("   ✅ docs/sessions/2025-10-25_session.md")
+    log.append("   ✅ docs/GITHUB_SETUP.md")
+    log.append("   ✅ docs/BUNDLE.md")
+
+    log.append("\n🚀 Next steps:")
+    log.append("   1. Review docs/GITHUB_SETUP.md")
+    log.append("   2. Create GitHub repository")
+    log.append("   3. Push initial commit")
+    log.append("   4. Test context loading URLs")
+
+    log.append("\n🔗 Quick URLs (after GitHub push):")
+    log.append(f"   {RAW}/docs/BUNDLE.md")
+    log.append(f"   {RAW}/docs/project_file_access.json")
+    log.append("\n")
+    _flush(log)
 
 
 if __name__ == "__main__":
-    try:
-        create_github_docs()
-    except Exception as e:
-        print(f"\n❌ ERROR: {e}")
\ No newline at end of file
+    # No catch-all: errors surface with a full traceback and exit status 1
+    create_github_docs()
@@ -4,105 +4,31 @@ Adds Dev Agent information to INIT_CONTEXT.md and creates final session notes
 
 Run this script, then regenerate project_file_access.json
 """
+import re
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
+from typing import Optional
+
+from async_writer import AsyncArtifactWriter
 
 
 # Central European Time (GMT+2)
 CET = timezone(timedelta(hours=2))
 
+# INIT_CONTEXT.md anchors: Dev Agent section goes before the first one found
+GETTING_STARTED = "## 🚀 Getting Started"
+DOC_STRUCTURE = "## 📚 Documentation Structure"
+PHASE_0 = "### Phase 0: Setup & Foundation - COMPLETE ✅"
+# Capturing group: split() keeps the markers at the odd positions
+_MARKERS_RE = re.compile("(" + "|".join(map(re.escape, (GETTING_STARTED, DOC_STRUCTURE, PHASE_0))) + ")")
 
-def update_init_context():
-    """Add Dev Agent section to INIT_CONTEXT.md"""
-
-    docs_dir = Path("docs")
-    init_context_file = docs_dir / "INIT_CONTEXT.md"
-
-    # Read existing content
-    with open(init_context_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Add Dev Agent section before "## 🚀 Getting Started"
-    dev_agent_section = """
-## 🤖 Development Agent (NEW!)
-
-### Automatic Development with Claude API + n8n
-
-UAE Legal Agent má vlastný **AI Development Agent** pre automatizáciu vývoja:
-
-```
-Prompt → Claude API → Code Generation → Auto-Save → Git Commit → Push → Done!
-```
-
-**Key Features:**
-- ✅ Automatic code generation via Claude API
-- ✅ Smart file path detection
-- ✅ Auto-save to project files
-- ✅ Automatic git add + commit + push
-- ✅ n8n workflow integration
-- ✅ Slack notifications
-- ✅ Persistent conversation history (no 40k token reload!)
-- ✅ Per-file token & cost tracking
-
-**Components:**
-1. **Python Agent:** `scripts/dev_agent.py`
-   - Claude API client
-   - Code block parser
-   - File system operations
-   - Git integration (GitPython)
-   - SQLite conversation history
-
-2. **n8n Workflow:** `scripts/n8n_dev_agent_workflow.json`
-   - Webhook trigger
-   - Python executor
-   - Response formatter
-   - Slack notifications
-
-3. **Documentation:** `docs/DEV_AGENT_SETUP.md`
-   - Complete setup guide
-   - Configuration examples
-   - Troubleshooting
-
-**Usage:**
-
-Terminal:
-```bash
-python scripts/dev_agent.py --project uae-legal-agent --prompt "Create src/rag/vector_store.py" --auto-commit
-```
-
-Webhook (n8n):
-```bash
-curl -X POST http://localhost:5678/webhook/dev-agent \
-  -d '{"prompt": "Create embeddings.py", "auto_commit": true}'
-```
-
-Slack (after setup):
-```
-/dev Create src/utils/helper.py with utility functions
-```
-
-**Cost Savings:**
-- Chat Interface: 800k tokens (20 chats × 40k reload)
-- Dev Agent: 42k tokens (1× load + 20 responses)
-- **Savings: 95%** 🎉
-
-**For complete setup instructions, see:** `docs/DEV_AGENT_SETUP.md`
-
----
+# Static doc text, loaded once at import (templates live in scripts/templates/)
+TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+DEV_AGENT_SECTION = (TEMPLATES_DIR / "dev_agent_section.md").read_text(encoding='utf-8')
+# Placeholders: {session_end}
+FINAL_SESSION_TMPL = (TEMPLATES_DIR / "final_session.md.tmpl").read_text(encoding='utf-8')
 
-"""
-
-    # Insert before "## 🚀 Getting Started"
-    if "## 🚀 Getting Started" in content:
-        content = content.replace("## 🚀 Getting Started", dev_agent_section + "## 🚀 Getting Started")
-    else:
-        # Fallback: add before ## 📚 Documentation Structure
-        content = content.replace("## 📚 Documentation Structure", dev_agent_section + "## 📚 Documentation Structure")
-
-    # Update Current Status section
-    content = content.replace(
-        "### Phase 0: Setup & Foundation - COMPLETE ✅",
-        """### Phase 0: Setup & Foundation - COMPLETE ✅
+PHASE_0_STATUS = PHASE_0 + """
 **Progress:** 100%
 
 **Completed Tasks:**
@@ -115,389 +41,62 @@ Slack (after setup):
 - ✅ **Development Agent implemented** 🤖
 - ✅ **n8n workflow created** 🔄
 - ✅ **Automatic code generation + Git integration** 🚀"""
-    )
 
-    # Write updated content
-    with open(init_context_file, 'w', encoding='utf-8') as f:
-        f.write(content)
+
+def update_init_context():
+    """Add Dev Agent section to INIT_CONTEXT.md"""
+
+    docs_dir = Path("docs")
+    init_context_file = docs_dir / "INIT_CONTEXT.md"
+
+    # Read existing content
+    content = init_context_file.read_text(encoding='utf-8')
+
+    # Split once at all markers; edits below touch only the marker slots
+    parts = _MARKERS_RE.split(content)
+    markers = parts[1::2]
+
+    # Insert before "## 🚀 Getting Started"
+    # (fallback: before "## 📚 Documentation Structure")
+    anchor = GETTING_STARTED if GETTING_STARTED in markers else DOC_STRUCTURE
+
+    replacements = {
+        anchor: DEV_AGENT_SECTION + anchor,
+        # Update Current Status section
+        PHASE_0: PHASE_0_STATUS,
+    }
+
+    # Single join builds the new file; no intermediate full-size copies
+    parts[1::2] = [replacements.get(marker, marker) for marker in markers]
+    content = "".join(parts)
+
+    # Write updated content (LF newlines on every platform, one write)
+    init_context_file.write_text(content, encoding='utf-8', newline='\n')
 
     print(f"✅ Updated {init_context_file}")
 
 
-def create_final_session_note():
-    """Create final session note with Dev Agent info"""
+def create_final_session_note(writer: Optional[AsyncArtifactWriter] = None):
+    """Create final session note with Dev Agent info
+
+    Args:
+        writer: Optional background writer; when given, the note is queued
+            and written while the caller continues
+    """
 
     now = datetime.now(CET)  # Using GMT+2 for local timestamps
     date_str = now.strftime("%Y-%m-%d")
     time_str = now.strftime("%H%M")
     session_file = Path(f"docs/sessions/{date_str}_{time_str}_final_session.md")
 
-    content = f"""# UAE Legal Agent - Final Session Summary
-**Date:** 2025-10-25  
-**Session:** Development Agent Implementation  
-**Duration:** ~1 hour  
-**Developer:** Zoltán Rauscher (ICC Komárno)  
-
----
-
-## 🎯 Session Goals
-
-1. ✅ Implement Development Agent with Claude API
-2. ✅ Create n8n workflow for automation
-3. ✅ Setup Git integration (auto-commit + push)
-4. ✅ Complete documentation
-5. ✅ Prepare for new chat context loading
-
----
-
-## 🤖 Development Agent Implementation
-
-### **Problem Identified:**
-Chat interface je neefektívny pre veľké projekty:
-- 20-50 chatov potrebných na projekt
-- 40k tokens reload pri každom novom chate
-- Celkovo 800k+ tokens zbytočne
-- Manuálne copy-paste kódu
-- Manuálne git operations
-
-### **Solution: AI Development Agent**
-
-Vytvoril som komplexný automatizovaný systém:
-
-#### **1. Python Agent (dev_agent.py)**
-
-**Features:**
-- Claude API integration
-- Code block detection & parsing
-- Smart filename suggestions
-- Automatic file saving
-- Git operations (add, commit, push)
-- Persistent conversation history (SQLite)
-- Token & cost tracking per file
-- Session management
-- JSON output mode pre n8n
-
-**Architecture:**
-```python
-class DevAgent:
-    - GitManager: Git operations wrapper
-    - CodeBlockParser: Extract code from responses
-    - ConversationDB: SQLite persistence
-    - Claude API client: Direct API calls
-```
-
-**Usage:**
-```bash
-python scripts/dev_agent.py \\
-  --project uae-legal-agent \\
-  --prompt "Create src/rag/vector_store.py" \\
-  --auto-commit
-```
-
-#### **2. n8n Workflow**
-
-**Nodes:**
-1. Webhook Trigger (POST /dev-agent)
-2. Input Parser (extract project, prompt, options)
-3. Python Executor (run dev_agent.py)
-4. Output Parser (extract JSON result)
-5. Response Formatter (create readable message)
-6. Webhook Response (return JSON)
-7. Slack Notification (optional)
-8. Error Handler
-
-**Integration Points:**
-- Webhook API
-- Slack (optional)
-- Email (optional)
-- Database logging
-
-#### **3. Complete Documentation**
-
-Created:
-- `docs/DEV_AGENT_SETUP.md` - Complete setup guide
-- Updated `docs/INIT_CONTEXT.md` - Added Dev Agent section
-- This session note
-
----
-
-## 📊 Technical Achievements
-
-### **Token Efficiency:**
-
-**Before (Chat Interface):**
-```
-Session 1: 40k tokens (load context)
-Session 2: 40k tokens (load context again)
-...
-Session 20: 40k tokens
-Total: 800k tokens
-Cost: ~$2.40 just for loading
-```
-
-**After (Dev Agent):**
-```
-First load: 2.5k tokens (context once)
-Message 1: +1.2k tokens
-Message 2: +0.8k tokens
-...
-Message 20: +0.9k tokens
-Total: ~42k tokens
-Cost: ~$0.15 total
-Savings: 95%!
-```
-
-### **Automation:**
-
-**Manual Workflow (Before):**
-```
-1. Write prompt in chat (1 min)
-2. Wait for response (30 sec)
-3. Copy code block (30 sec)
-4. Open PyCharm (10 sec)
-5. Create file (20 sec)
-6. Paste code (10 sec)
-7. Save file (5 sec)
-8. git add (10 sec)
-9. git commit (30 sec)
-10. git push (20 sec)
-Total: ~4 minutes per file
-```
-
-**Automated Workflow (After):**
-```
-1. Send prompt to webhook (5 sec)
-2. Agent does everything (30 sec)
-3. Receive Slack notification (instant)
-Total: ~35 seconds per file
-
-Speedup: 7× faster!
-```
-
----
-
-## 🔧 Technical Implementation
-
-### **Dependencies Added:**
-```txt
-gitpython>=3.1.40  # Git operations
-```
-
-### **Database Schema:**
-
-**conversations table:**
-```sql
-CREATE TABLE conversations (
-    id INTEGER PRIMARY KEY,
-    project TEXT,
-    session TEXT,
-    role TEXT,
-    content TEXT,
-    tokens INTEGER,
-    cost_usd REAL,
-    created_at TIMESTAMP
-);
-```
-
-**actions table:**
-```sql
-CREATE TABLE actions (
-    id INTEGER PRIMARY KEY,
-    action_type TEXT,  -- 'file_created', 'git_commit', 'git_push'
-    file_path TEXT,
-    commit_hash TEXT,
-    success BOOLEAN,
-    error_message TEXT,
-    created_at TIMESTAMP
-);
-```
-
-### **Git Integration:**
-
-Using GitPython library:
-```python
-class GitManager:
-    def add(file_path) -> bool
-    def commit(message) -> (bool, output)
-    def push(remote, branch) -> (bool, output)
-    def status() -> str
-    def diff(file_path) -> str
-```
-
-### **Code Block Parsing:**
-
-Regex patterns:
-```python
-# Extract code blocks
-r'```(\\w+)?\\n(.*?)```'
-
-# Detect file paths in prompts
-r'(?:Create|create|make|add)\\s+([a-zA-Z0-9_/\\\\.-]+\\.(py|md|txt))'
-
-# Extract class names for filename suggestions
-r'class\\s+(\\w+)'
-```
-
----
-
-## 💡 Key Insights
-
-### **1. API vs. Chat Interface**
-- Chat interface je výborný pre learning a diskusiu
-- API je výborný pre production a automatizáciu
-- Môžeme používať OBE! Chat pre vývoj, API pre aplikáciu
-
-### **2. Context Persistence**
-- SQLite databáza eliminuje 40k token reload
-- Conversation history sa ukladá lokálne
-- Môžeme mať neobmedzené sessions
-
-### **3. Automation ROI**
-- Initial setup: ~1 hodina
-- Time savings: ~3.5 min per file
-- Break-even: ~17 files
-- Typical project: 100+ files → massive savings
-
-### **4. n8n Integration**
-- n8n poskytuje enterprise orchestration
-- Webhook API umožňuje integráciu odkiaľkoľvek
-- Slack/Email notifications improve UX
-- Error handling ensures reliability
-
----
-
-## 🎓 Lessons Learned
-
-### **Git Operations:**
-- GitPython je reliable wrapper
-- Always check success status
-- Handle merge conflicts gracefully
-- Commit messages should be semantic
-
-### **Code Block Parsing:**
-- Regex patterns work well for markdown
-- Smart filename suggestions improve UX
-- Context analysis helps with path detection
-- Multiple code blocks per response supported
-
-### **Error Handling:**
-- Git operations can fail (merge conflicts, auth)
-- File system permissions matter
-- Always log errors to database
-- Provide actionable error messages
-
----
-
-## 📈 Project Status Update
-
-### **Completed Today:**
-- ✅ Development Agent implementation
-- ✅ n8n workflow creation
-- ✅ Git integration
-- ✅ Complete documentation
-- ✅ Test runs successful
-
-### **Current Phase:**
-**Phase 0: Setup & Foundation - 100% COMPLETE** ✅
-
-All infrastructure is ready for actual legal analysis development!
-
-### **Next Phase:**
-**Phase 1: Legal Analysis Prototype**
-- Test Claude API with real UAE case
-- Implement manual law context
-- Generate alternative strategies
-- Risk assessment
-- Timeline & cost estimates
-
----
-
-## 🚀 Deployment Ready
-
-### **What We Have:**
-1. ✅ Functional Claude API client
-2. ✅ Development Agent for code generation
-3. ✅ n8n workflow for automation
-4. ✅ Git integration for version control
-5. ✅ Complete documentation
-6. ✅ Token & cost tracking
-7. ✅ Persistent conversation history
-
-### **Production Architecture:**
-```
-Developer → Slack/Webhook → n8n → Python Agent → Claude API
-                                          ↓
-                                    Save Files
-                                          ↓
-                                    Git Commit/Push
-                                          ↓
-                                    GitHub Repository
-                                          ↓
-                                    Slack Notification
-```
-
----
-
-## 📊 Final Statistics
-
-### **Session Metrics:**
-- Duration: ~1 hour
-- Files created: 3 major files
-- Lines of code: ~800 LOC
-- Documentation: ~500 lines
-- Token usage: ~125k tokens
-- Cost: ~$0.38
-
-### **Project Totals (Phase 0):**
-- Total files: 30+
-- Python code: ~1,500 LOC
-- Documentation: ~5,000 words
-- Test coverage: Basic tests passing
-- Git commits: 5+
-- Total cost: ~$0.50 (with free credit)
-
----
-
-## 🔗 Important URLs
-
-### **For New Chat Context Loading:**
-```
-https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/INIT_CONTEXT.md
-https://raw.githubusercontent.com/rauschiccsk/uae-legal-agent/main/docs/project_file_access.json
-```
-
-**These TWO URLs load complete project context in new Claude chat!**
-
-### **Development Agent:**
-```
-Setup: docs/DEV_AGENT_SETUP.md
-Script: scripts/dev_agent.py
-Workflow: scripts/n8n_dev_agent_workflow.json
-```
-
----
-
-## ✅ Ready for Next Session
-
-**New chat should:**
-1. Load context from 2 URLs above
-2. Review current status (Phase 0 complete)
-3. Start Phase 1: Legal Analysis Prototype
-4. Use Dev Agent for code generation
-
-**Infrastructure Complete!** 🎉
-
----
-
-**Session End:** {datetime.now(CET).strftime('%Y-%m-%d %H:%M:%S')}  
-**Status:** ✅ Phase 0 Complete + Dev Agent Ready  
-**Next Session:** Legal Analysis Prototype (Phase 1)  
-
-🤖 **Automation Achieved. Development Accelerated. Ready for Production.** 🚀
-"""
+    content = FINAL_SESSION_TMPL.format_map({
+        "session_end": now.strftime('%Y-%m-%d %H:%M:%S')
+    })
 
-    with open(session_file, 'w', encoding='utf-8') as f:
-        f.write(content)
+    if writer is not None:
+        writer.submit(session_file, content)
+    else:
+        session_file.write_text(content, encoding='utf-8', newline='\n')
 
     print(f"✅ Created {session_file}")
 
@@ -534,5 +133,7 @@ def print_instructions():
 
 if __name__ == "__main__":
     update_init_context()
-    create_final_session_note()
-    print_instructions()
\ No newline at end of file
+    # Session note is written in the background while instructions print
+    with AsyncArtifactWriter() as writer:
+        create_final_session_note(writer)
+        print_instructions()
\ No newline at end of file
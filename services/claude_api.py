@@ -1,24 +1,287 @@
 """Claude API wrapper modul pre UAE legal analysis."""
 
+import asyncio
+import hashlib
+import json
 import logging
+import threading
 import time
-from typing import Dict, List, Optional, Any
-from anthropic import Anthropic, APIError, RateLimitError, APIConnectionError
-from utils.config import Settings
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Any
+
+from utils.config import Settings, get_settings
+from utils.http_client import get_http_client, http_pool_options
 from utils.logger import get_logger
 
+if TYPE_CHECKING:
+    import numpy as np
+    from anthropic import Anthropic, AsyncAnthropic, APIError, RateLimitError, APIConnectionError
+
+# anthropic SDK (and httpx under it) is imported on first ClaudeClient,
+# not at module import - see _load_sdk() / __getattr__
+_SDK_NAMES = ("Anthropic", "AsyncAnthropic", "APIError", "RateLimitError", "APIConnectionError")
+
 logger = get_logger(__name__)
 
+# System prompt pre UAE legal expert (rovnaký pre všetky volania)
+LEGAL_SYSTEM_PROMPT = """Si expert na právo Spojených Arabských Emirátov (UAE) s hlbokými znalosťami federálnych zákonov, emirátových predpisov a judikatúry.
+
+TVOJA ÚLOHA:
+- Analyzuj právne prípady v kontexte UAE legislatívy
+- Poskytuj presné odpovede založené na aktuálnych zákonoch
+- Cituj zdroje vo formáte: [Federal Law No. X/YYYY, Article Z]
+- Vždy odpovedaj v slovenčine
+
+ŠTRUKTÚRA ANALÝZY:
+1. Zhrnutie situácie
+2. Aplikovateľné zákony a články
+3. Právna analýza
+4. Odporúčania a riziká
+5. Ďalšie kroky
+
+PRAVIDLÁ:
+- Používaj presné citácie zákonov
+- Uvádzaj príklady z judikatúry ak sú relevantné
+- Jasne rozlišuj fakty od právnej interpretácie
+- Upozorni na riziká a alternatívy
+- Slovenský jazyk vo všetkých odpovediach"""
+
+# User prompt šablóny (premenné časti sa dopĺňajú cez format_map)
+_LAWS_BLOCK_TMPL = "RELEVANTNÉ UAE ZÁKONY:\n{laws}"
+_ANALYZE_USER_TMPL = "KONTEXT PRÍPADU:\n{case}\n\nOTÁZKA:\n{q}"
+_ALTERNATIVES_TMPL = """Na základe nasledujúceho prípadu vygeneruj 3-5 alternatívnych právnych stratégií:
+
+PRÍPAD:
+{case}
+
+PRÁVNY KONTEXT:
+{laws}
+
+Pre každú alternatívu uveď:
+1. Názov stratégie
+2. Popis postupu
+3. Hodnotenie rizika (Low/Medium/High)
+4. Odhadovaný časový harmonogram
+5. Nákladové implikácie
+6. Výhody a nevýhody
+
+Formátuj odpoveď jasne a štruktúrovane v slovenčine."""
+
+# Tool pre štruktúrovanú analýzu: model vráti JSON priamo (bez parsovania prózy)
+LEGAL_ANALYSIS_TOOL = {
+    "name": "legal_analysis",
+    "description": "Štruktúrovaný výsledok právnej analýzy UAE prípadu",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "analysis": {"type": "string", "description": "Právna analýza prípadu"},
+            "alternatives": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Alternatívne právne stratégie"
+            },
+            "risk_assessment": {"type": "string", "description": "Hodnotenie rizík"},
+            "estimated_cost": {"type": "number", "description": "Odhadované náklady v AED"}
+        },
+        "required": ["analysis", "alternatives", "risk_assessment"]
+    }
+}
+
+# Cache hotových analýz: zhodná otázka do 10 minút nejde na API
+RESPONSE_CACHE_SIZE = 512
+RESPONSE_CACHE_TTL = 600.0
+
+# Výsledok connection probe platí 30s (health poll nestojí API volanie)
+HEALTH_CHECK_TTL = 30.0
+_HEALTH_KEY = "health"
+
+# Limit veľkosti promptu (context window 200k mínus rezerva na odpoveď)
+MAX_PROMPT_TOKENS = 180_000
+TOKEN_COUNT_CACHE_SIZE = 1024
+
+# Max súbežných async volaní na klienta - ďalšie čakajú vo fronte,
+# namiesto 429 a retry búrky pri náraste záťaže
+MAX_CONCURRENT_REQUESTS = 10
+
+# Retry s exponenciálnym backoffom (1s, 2s, ...)
+MAX_RETRIES = 3
+BASE_DELAY = 1.0
+
+
+def __getattr__(name: str) -> Any:
+    """Sprístupní triedy anthropic SDK ako atribúty modulu (lazy import)."""
+    if name in _SDK_NAMES:
+        import anthropic
+        value = globals()[name] = getattr(anthropic, name)
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _load_sdk():
+    """Importuje anthropic SDK do globals modulu, ak tam ešte nie je."""
+    for name in _SDK_NAMES:
+        if name not in globals():
+            __getattr__(name)
+
+
+def _utf8_size(text: str) -> int:
+    """Veľkosť textu v bajtoch UTF-8; ASCII text sa nekóduje (bajt = znak)."""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def request_key(
+    case_context: str,
+    legal_context: str,
+    query: str,
+    history: Optional[List[Dict[str, Any]]] = None
+) -> str:
+    """
+    Vráti stabilný hash požiadavky na analýzu (BLAKE2b).
+    
+    Args:
+        case_context: Kontext prípadu
+        legal_context: Relevantné UAE zákony a predpisy
+        query: Otázka na analýzu
+        history: Voliteľná história konverzácie
+        
+    Returns:
+        Hex digest - rovnaký pre textovo zhodné požiadavky
+    """
+    payload = json.dumps(
+        {"c": case_context, "l": legal_context, "q": query, "h": history or []},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class TTLCache:
+    """Thread-safe LRU cache s expiráciou položiek po ttl sekundách."""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Vráti uloženú hodnotu, alebo None ak chýba či expirovala.
+        
+        Args:
+            key: Kľúč položky
+            
+        Returns:
+            Hodnota alebo None
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any):
+        """
+        Uloží hodnotu; pri plnej cache vyhodí najdlhšie nepoužitú položku.
+        
+        Args:
+            key: Kľúč položky
+            value: Hodnota
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+def _for_running_loop(resources: Dict[asyncio.AbstractEventLoop, Any], factory: Callable[[], Any]) -> Any:
+    """
+    Vráti objekt pre bežiaci event loop, pri prvom použití ho vytvorí.
+    
+    Objekty zatvorených loopov sa pri tom zahodia - drží ich silnou
+    referenciou aj samotný objekt, takže weakref by ich neuvoľnil.
+    
+    Args:
+        resources: Slovník loop -> objekt (upravuje sa na mieste)
+        factory: Vytvorí objekt pre nový loop
+        
+    Returns:
+        Objekt patriaci aktuálnemu loopu
+        
+    Raises:
+        RuntimeError: Ak nebeží žiadny event loop
+    """
+    loop = asyncio.get_running_loop()
+    resource = resources.get(loop)
+    if resource is None:
+        # list() snapshot: loops in other threads may register meanwhile
+        for other in list(resources):
+            if other.is_closed():
+                resources.pop(other, None)
+        resource = resources[loop] = factory()
+    return resource
+
+
+class SingleFlight:
+    """Zlučuje súbežné zhodné async volania do jedného."""
+    
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+    
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Spustí factory() pre daný kľúč, alebo počká na už bežiace volanie.
+        
+        Args:
+            key: Kľúč požiadavky (napr. request_key)
+            factory: Vytvorí coroutine, ktorá volanie vykoná
+            
+        Returns:
+            Výsledok volania (zdieľaný všetkými čakajúcimi)
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            logger.info(f"Coalescing duplicate in-flight request {key}")
+        
+        # shield: a cancelled caller must not cancel the call for the others
+        return await asyncio.shield(future)
+    
+    def _forget(self, key: str, future: asyncio.Future):
+        """Odstráni dokončené volanie z evidencie."""
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
 
 class ClaudeClient:
     """Claude API client pre UAE legal analysis."""
     
-    def __init__(self, config: Settings):
+    # Claude Sonnet 4.5 ceny v centoch za milión tokenov - celé čísla,
+    # cena sa počíta v int a na USD sa prevedie jediným násobením
+    PRICE_INPUT = 300
+    PRICE_OUTPUT = 1500
+    PRICE_CACHE_READ = 30
+    PRICE_CACHE_WRITE = 375
+    USD_PER_PRICE_UNIT = 1e-8
+    
+    def __init__(self, config: Settings, sleep: Callable[[float], None] = time.sleep):
         """
         Inicializuje Claude client.
         
         Args:
             config: Settings objekt s konfiguráciou
+            sleep: Funkcia na čakanie medzi sync retry pokusmi (v testoch no-op)
             
         Raises:
             ValueError: Ak chýba API key
@@ -26,13 +289,89 @@ class ClaudeClient:
         if not hasattr(config, 'anthropic_api_key') or not config.anthropic_api_key:
             raise ValueError("ANTHROPIC_API_KEY is required in config")
         
+        _load_sdk()
         self.config = config
-        self.client = Anthropic(api_key=config.anthropic_api_key)
+        self.client = Anthropic(api_key=config.anthropic_api_key, http_client=get_http_client())
         self.model = "claude-sonnet-4-5-20250929"
         self.max_tokens = 8000
+        self._singleflight = SingleFlight()
+        self._response_cache = TTLCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL)
+        # Token count of a given prompt never changes - entries do not expire
+        self._token_counts = TTLCache(TOKEN_COUNT_CACHE_SIZE, float("inf"))
+        self._health_cache = TTLCache(1, HEALTH_CHECK_TTL)
+        # Async client pool and semaphore are bound to the loop that first
+        # uses them - keep one of each per event loop
+        self._loop_clients: Dict[asyncio.AbstractEventLoop, "AsyncAnthropic"] = {}
+        self._loop_semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+        self._async_client_override: Optional["AsyncAnthropic"] = None
+        self._semaphore_override: Optional[asyncio.Semaphore] = None
+        self._sleep = sleep
         
         logger.info(f"ClaudeClient inicializovaný: model={self.model}, max_tokens={self.max_tokens}")
     
+    @property
+    def async_client(self) -> "AsyncAnthropic":
+        """
+        AsyncAnthropic client pre *_async metódy v bežiacom event loope.
+        
+        httpx.AsyncClient pool patrí loopu, v ktorom vznikol - každý loop
+        (napr. ďalší asyncio.run) dostane vlastný client, vytvorený pri
+        prvom použití. Priradený client (testy) sa použije v každom loope.
+        
+        Returns:
+            AsyncAnthropic s vlastným httpx.AsyncClient (rovnaké limity poolu)
+            
+        Raises:
+            RuntimeError: Ak nebeží žiadny event loop
+        """
+        if self._async_client_override is not None:
+            return self._async_client_override
+        
+        return _for_running_loop(self._loop_clients, self._create_async_client)
+    
+    @async_client.setter
+    def async_client(self, client: "AsyncAnthropic"):
+        self._async_client_override = client
+    
+    @property
+    def _semaphore(self) -> asyncio.Semaphore:
+        """
+        Semafor MAX_CONCURRENT_REQUESTS pre bežiaci event loop.
+        
+        Semafor sa po prvom súperení naviaže na loop, preto má každý loop
+        vlastný. Priradený semafor (testy) sa použije v každom loope.
+        
+        Returns:
+            asyncio.Semaphore pre aktuálny loop
+            
+        Raises:
+            RuntimeError: Ak nebeží žiadny event loop
+        """
+        if self._semaphore_override is not None:
+            return self._semaphore_override
+        
+        return _for_running_loop(
+            self._loop_semaphores, lambda: asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        )
+    
+    @_semaphore.setter
+    def _semaphore(self, semaphore: asyncio.Semaphore):
+        self._semaphore_override = semaphore
+    
+    def _create_async_client(self) -> "AsyncAnthropic":
+        """
+        Vytvorí AsyncAnthropic client s vlastným httpx.AsyncClient poolom.
+        
+        Returns:
+            AsyncAnthropic (rovnaké limity poolu ako sync client)
+        """
+        from anthropic import DefaultAsyncHttpxClient
+        
+        return AsyncAnthropic(
+            api_key=self.config.anthropic_api_key,
+            http_client=DefaultAsyncHttpxClient(**http_pool_options())
+        )
+    
     def get_legal_system_prompt(self) -> str:
         """
         Vráti system prompt pre UAE legal expert.
@@ -40,27 +379,94 @@ class ClaudeClient:
         Returns:
             System prompt string
         """
-        return """Si expert na právo Spojených Arabských Emirátov (UAE) s hlbokými znalosťami federálnych zákonov, emirátových predpisov a judikatúry.
-
-TVOJA ÚLOHA:
-- Analyzuj právne prípady v kontexte UAE legislatívy
-- Poskytuj presné odpovede založené na aktuálnych zákonoch
-- Cituj zdroje vo formáte: [Federal Law No. X/YYYY, Article Z]
-- Vždy odpovedaj v slovenčine
-
-ŠTRUKTÚRA ANALÝZY:
-1. Zhrnutie situácie
-2. Aplikovateľné zákony a články
-3. Právna analýza
-4. Odporúčania a riziká
-5. Ďalšie kroky
-
-PRAVIDLÁ:
-- Používaj presné citácie zákonov
-- Uvádzaj príklady z judikatúry ak sú relevantné
-- Jasne rozlišuj fakty od právnej interpretácie
-- Upozorni na riziká a alternatívy
-- Slovenský jazyk vo všetkých odpovediach"""
+        return LEGAL_SYSTEM_PROMPT
+    
+    def _build_case_messages(
+        self,
+        case_context: str,
+        legal_context: str,
+        query: str,
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Zostaví správy pre analýzu prípadu (história + aktuálny dotaz).
+        
+        Koniec histórie a blok so zákonmi sú označené cache_control, takže
+        Anthropic pri ďalšom volaní číta tento prefix z prompt cache. Cache
+        hit nastane iba ak je legal_context (a história) textovo zhodný
+        s predchádzajúcim volaním - volajúci by mal posielať ten istý text.
+        
+        Args:
+            case_context: Kontext prípadu
+            legal_context: Relevantné UAE zákony a predpisy
+            query: Otázka na analýzu
+            history: Voliteľná história konverzácie
+            
+        Returns:
+            Zoznam správ pre Claude API
+        """
+        # Aktuálny dotaz: stabilné zákony (cache) pred premenlivou časťou
+        user_message = {
+            "role": "user",
+            "content": [
+                {
+                    "type": "text",
+                    "text": _LAWS_BLOCK_TMPL.format_map({"laws": legal_context}),
+                    "cache_control": {"type": "ephemeral"}
+                },
+                {
+                    "type": "text",
+                    "text": _ANALYZE_USER_TMPL.format_map({"case": case_context, "q": query})
+                }
+            ]
+        }
+        
+        if not history:
+            return [user_message]
+        
+        # História + dotaz v jednom list literáli (posledný turn = hranica cache)
+        return [
+            *islice(history, len(history) - 1),
+            self._with_cache_breakpoint(history[-1]),
+            user_message
+        ]
+    
+    def _with_cache_breakpoint(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Vráti kópiu správy s cache_control na jej poslednom content bloku.
+        
+        Args:
+            message: Správa s content ako string alebo zoznam blokov
+            
+        Returns:
+            Nová správa (pôvodná sa nemení)
+        """
+        content = message["content"]
+        if isinstance(content, str):
+            blocks = [{"type": "text", "text": content}]
+        else:
+            blocks = list(content)
+        blocks[-1] = {**blocks[-1], "cache_control": {"type": "ephemeral"}}
+        return {**message, "content": blocks}
+    
+    def _build_alternatives_messages(
+        self,
+        case_summary: str,
+        legal_context: str
+    ) -> List[Dict[str, str]]:
+        """
+        Zostaví správy pre generovanie alternatívnych stratégií.
+        
+        Args:
+            case_summary: Zhrnutie prípadu
+            legal_context: Právny kontext
+            
+        Returns:
+            Zoznam správ pre Claude API
+        """
+        prompt = _ALTERNATIVES_TMPL.format_map({"case": case_summary, "laws": legal_context})
+        
+        return [{"role": "user", "content": prompt}]
     
     def analyze_legal_case(
         self,
@@ -81,42 +487,178 @@ PRAVIDLÁ:
         Returns:
             Dict s response, token_usage, cost, model
         """
+        key = request_key(case_context, legal_context, query, history)
+        cached = self._cached_response(key)
+        if cached is not None:
+            return cached
+        
         logger.info("Spúšťam analýzu právneho prípadu")
         
-        # Priprav správy
-        messages = []
+        result = self._call_claude_api(
+            messages=self._build_case_messages(case_context, legal_context, query, history),
+            system=self.get_legal_system_prompt(),
+            max_tokens=self.max_tokens
+        )
+        
+        logger.info(f"Analýza dokončená: tokens={result['token_usage']['total']}, cost=${result['cost']:.6f}")
         
-        # Pridaj históriu ak existuje
-        if history:
-            messages.extend(history)
+        self._cache_response(key, result)
+        return result
+    
+    async def analyze_legal_case_async(
+        self,
+        case_context: str,
+        legal_context: str,
+        query: str,
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Asynchrónna verzia analyze_legal_case - neblokuje event loop.
         
-        # Pridaj aktuálny dotaz
-        user_message = f"""KONTEXT PRÍPADU:
-{case_context}
-
-RELEVANTNÉ UAE ZÁKONY:
-{legal_context}
-
-OTÁZKA:
-{query}"""
+        Zhodné požiadavky, ktoré prídu počas bežiaceho volania (retry
+        klienta, duplicitný webhook), čakajú na to isté volanie a dostanú
+        jeho výsledok - duplikát nestojí žiadne tokeny. Každý čakajúci
+        dostane vlastnú kópiu, takže úprava jedného výsledku sa neprejaví
+        u ostatných.
         
-        messages.append({
-            "role": "user",
-            "content": user_message
-        })
+        Args:
+            case_context: Kontext prípadu
+            legal_context: Relevantné UAE zákony a predpisy
+            query: Otázka na analýzu
+            history: Voliteľná história konverzácie
+            
+        Returns:
+            Dict s response, token_usage, cost, model
+        """
+        key = request_key(case_context, legal_context, query, history)
+        cached = self._cached_response(key)
+        if cached is not None:
+            return cached
         
-        system_prompt = self.get_legal_system_prompt()
+        result = await self._singleflight.do(
+            key,
+            lambda: self._analyze_legal_case_async(key, case_context, legal_context, query, history)
+        )
+        # Coalesced waiters share one result object - hand each its own copy
+        return {**result, "token_usage": dict(result["token_usage"])}
+    
+    async def analyze_legal_cases_async(self, cases: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Analyzuje viac prípadov naraz - všetky volania bežia súbežne.
         
-        result = self._call_claude_api(
-            messages=messages,
-            system=system_prompt,
+        Rovnaké prípady v jednej dávke sa zlúčia do jedného API volania
+        (cez singleflight v analyze_legal_case_async). Chyba jedného
+        prípadu nezruší ostatné.
+        
+        Args:
+            cases: Zoznam kwargs pre analyze_legal_case_async
+                (case_context, legal_context, query, voliteľne history)
+            
+        Returns:
+            Výsledky v poradí vstupu; pri chybe je na danej pozícii výnimka
+        """
+        logger.info(f"Spúšťam dávkovú analýzu: {len(cases)} prípadov")
+        
+        return await asyncio.gather(
+            *(self.analyze_legal_case_async(**case) for case in cases),
+            return_exceptions=True
+        )
+    
+    async def _analyze_legal_case_async(
+        self,
+        key: str,
+        case_context: str,
+        legal_context: str,
+        query: str,
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, Any]:
+        """Vykoná async analýzu (bez zlučovania duplikátov) a uloží ju do cache."""
+        logger.info("Spúšťam analýzu právneho prípadu (async)")
+        
+        result = await self._call_claude_api_async(
+            messages=self._build_case_messages(case_context, legal_context, query, history),
+            system=self.get_legal_system_prompt(),
             max_tokens=self.max_tokens
         )
         
         logger.info(f"Analýza dokončená: tokens={result['token_usage']['total']}, cost=${result['cost']:.6f}")
         
+        self._cache_response(key, result)
         return result
     
+    def _cache_response(self, key: str, result: Dict[str, Any]):
+        """
+        Uloží snapshot výsledku do response cache.
+        
+        Volajúci dostane pôvodný dict; cache drží vlastnú kópiu, takže
+        úprava vráteného token_usage nepoškodí neskoršie cache hity.
+        
+        Args:
+            key: request_key požiadavky
+            result: Výsledok z _call_claude_api / _call_claude_api_async
+        """
+        self._response_cache.set(key, {**result, "token_usage": dict(result["token_usage"])})
+    
+    def _cached_response(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Vráti analýzu z response cache v tvare bežného výsledku.
+        
+        Hit nestojí nič: cost je 0.0 a token_usage má cache_hit=True.
+        
+        Args:
+            key: request_key požiadavky
+            
+        Returns:
+            Dict s response, token_usage, cost, model alebo None
+        """
+        result = self._response_cache.get(key)
+        if result is None:
+            return None
+        
+        logger.info(f"Response cache hit {key}")
+        return {
+            "response": result["response"],
+            "token_usage": {**result["token_usage"], "cache_hit": True},
+            "cost": 0.0,
+            "model": result["model"]
+        }
+    
+    def analyze_legal_case_structured(
+        self,
+        case_context: str,
+        legal_context: str,
+        query: str,
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Analyzuje prípad a vráti štruktúrovaný výsledok cez tool use.
+        
+        Model je donútený zavolať LEGAL_ANALYSIS_TOOL, takže analýza aj
+        alternatívy prídu ako hotový JSON - bez regex parsovania textu.
+        
+        Args:
+            case_context: Kontext prípadu
+            legal_context: Relevantné UAE zákony a predpisy
+            query: Otázka na analýzu
+            history: Voliteľná história konverzácie
+            
+        Returns:
+            Dict s analysis, alternatives, risk_assessment, (estimated_cost),
+            token_usage, cost, model
+        """
+        logger.info("Spúšťam štruktúrovanú analýzu právneho prípadu")
+        
+        result = self._call_claude_api(
+            messages=self._build_case_messages(case_context, legal_context, query, history),
+            system=self.get_legal_system_prompt(),
+            max_tokens=self.max_tokens,
+            tools=[LEGAL_ANALYSIS_TOOL],
+            tool_choice={"type": "tool", "name": LEGAL_ANALYSIS_TOOL["name"]}
+        )
+        
+        # Tool input fields at the top level, next to token_usage / cost / model
+        return {**result.pop("response"), **result}
+    
     def generate_alternatives(
         self,
         case_summary: str,
@@ -134,30 +676,36 @@ OTÁZKA:
         """
         logger.info("Generujem alternatívne stratégie")
         
-        prompt = f"""Na základe nasledujúceho prípadu vygeneruj 3-5 alternatívnych právnych stratégií:
-
-PRÍPAD:
-{case_summary}
-
-PRÁVNY KONTEXT:
-{legal_context}
-
-Pre každú alternatívu uveď:
-1. Názov stratégie
-2. Popis postupu
-3. Hodnotenie rizika (Low/Medium/High)
-4. Odhadovaný časový harmonogram
-5. Nákladové implikácie
-6. Výhody a nevýhody
-
-Formátuj odpoveď jasne a štruktúrovane v slovenčine."""
+        result = self._call_claude_api(
+            messages=self._build_alternatives_messages(case_summary, legal_context),
+            system=self.get_legal_system_prompt(),
+            max_tokens=self.max_tokens
+        )
         
-        messages = [{"role": "user", "content": prompt}]
-        system_prompt = self.get_legal_system_prompt()
+        logger.info(f"Alternatívy vygenerované: tokens={result['token_usage']['total']}")
         
-        result = self._call_claude_api(
-            messages=messages,
-            system=system_prompt,
+        return result
+    
+    async def generate_alternatives_async(
+        self,
+        case_summary: str,
+        legal_context: str
+    ) -> Dict[str, Any]:
+        """
+        Asynchrónna verzia generate_alternatives - neblokuje event loop.
+        
+        Args:
+            case_summary: Zhrnutie prípadu
+            legal_context: Právny kontext
+            
+        Returns:
+            Dict so strukturovanými alternatívami
+        """
+        logger.info("Generujem alternatívne stratégie (async)")
+        
+        result = await self._call_claude_api_async(
+            messages=self._build_alternatives_messages(case_summary, legal_context),
+            system=self.get_legal_system_prompt(),
             max_tokens=self.max_tokens
         )
         
@@ -165,11 +713,365 @@ Formátuj odpoveď jasne a štruktúrovane v slovenčine."""
         
         return result
     
+    async def stream_analyze(
+        self,
+        case_context: str,
+        legal_context: str,
+        query: str,
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streamuje analýzu právneho prípadu po častiach textu.
+        
+        Prvé bajty odpovede sú k dispozícii hneď, nie až po vygenerovaní
+        celej analýzy. Token usage a cena sa zalogujú po skončení streamu.
+        
+        Args:
+            case_context: Kontext prípadu
+            legal_context: Relevantné UAE zákony a predpisy
+            query: Otázka na analýzu
+            history: Voliteľná história konverzácie
+            
+        Yields:
+            Časti textu odpovede v poradí, ako prichádzajú
+            
+        Raises:
+            ValueError: Ak prompt presahuje MAX_PROMPT_TOKENS
+        """
+        logger.info("Spúšťam streamovanú analýzu právneho prípadu")
+        
+        system = self.get_legal_system_prompt()
+        messages = self._build_case_messages(case_context, legal_context, query, history)
+        await self._ensure_prompt_fits_async(messages, system)
+        
+        async with self._semaphore, self.async_client.messages.stream(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            system=self._system_blocks(system),
+            messages=messages
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+            
+            final_message = await stream.get_final_message()
+        
+        result = self._build_result(final_message)
+        logger.info(f"Streamovaná analýza dokončená: tokens={result['token_usage']['total']}, cost=${result['cost']:.6f}")
+    
+    async def analyze_with_alternatives_async(
+        self,
+        case_context: str,
+        legal_context: str,
+        query: str,
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Spustí analýzu prípadu a generovanie alternatív súbežne.
+        
+        Obe volania sú nezávislé, takže celková latencia je
+        max(analýza, alternatívy) namiesto ich súčtu.
+        
+        Args:
+            case_context: Kontext prípadu (slúži aj ako zhrnutie pre alternatívy)
+            legal_context: Relevantné UAE zákony a predpisy
+            query: Otázka na analýzu
+            history: Voliteľná história konverzácie
+            
+        Returns:
+            Dict s kľúčmi analysis a alternatives (výsledky oboch volaní)
+        """
+        analysis, alternatives = await asyncio.gather(
+            self.analyze_legal_case_async(case_context, legal_context, query, history),
+            self.generate_alternatives_async(case_context, legal_context)
+        )
+        
+        return {"analysis": analysis, "alternatives": alternatives}
+    
+    async def check_connection_async(self) -> bool:
+        """
+        Overí spojenie s Claude API bez blokovania event loopu.
+        
+        Pošle minimálnu správu (max_tokens=1) cez zdieľaný async client,
+        takže health check nečaká na odpoveď v thread poole. Výsledok
+        sa drží HEALTH_CHECK_TTL sekúnd a súbežné probe čakajú na jedno
+        volanie.
+        
+        Returns:
+            True ak API odpovedalo, inak False
+        """
+        status = self._health_cache.get(_HEALTH_KEY)
+        if status is not None:
+            return status
+        
+        return await self._singleflight.do(_HEALTH_KEY, self._probe_connection)
+    
+    async def _probe_connection(self) -> bool:
+        """Vykoná connection probe a uloží výsledok do health cache."""
+        try:
+            await self.async_client.messages.create(
+                model=self.model,
+                max_tokens=1,
+                messages=[{"role": "user", "content": "ping"}]
+            )
+        except Exception as e:
+            logger.warning(f"Claude API connection check failed: {e}")
+            status = False
+        else:
+            status = True
+        
+        self._health_cache.set(_HEALTH_KEY, status)
+        return status
+    
+    def _build_result(self, response: Any) -> Dict[str, Any]:
+        """
+        Prevedie Claude API response na výsledný dict.
+        
+        Args:
+            response: Odpoveď z messages.create
+            
+        Returns:
+            Dict s response, token_usage, cost, model
+        """
+        block = response.content[0]
+        usage = response.usage
+        input_tokens = usage.input_tokens
+        output_tokens = usage.output_tokens
+        total_tokens = input_tokens + output_tokens
+        # Prompt caching: None when the request used no cache
+        cache_read_tokens = usage.cache_read_input_tokens or 0
+        cache_write_tokens = usage.cache_creation_input_tokens or 0
+        
+        cost = self.calculate_cost(input_tokens, output_tokens, cache_read_tokens, cache_write_tokens)
+        
+        result = {
+            # Tool use returns the parsed tool input instead of text
+            "response": block.input if getattr(block, "type", None) == "tool_use" else block.text,
+            "token_usage": {
+                "input": input_tokens,
+                "output": output_tokens,
+                "total": total_tokens,
+                "cache_read": cache_read_tokens,
+                "cache_write": cache_write_tokens
+            },
+            "cost": cost,
+            "model": self.model
+        }
+        
+        logger.info(
+            f"API call successful: input={input_tokens}, output={output_tokens}, "
+            f"cache_read={cache_read_tokens}, cost=${cost:.6f}"
+        )
+        
+        return result
+    
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """
+        Rozhodne, či sa má neúspešný API call zopakovať.
+        
+        Args:
+            error: Výnimka z API callu
+            attempt: Index pokusu (od 0)
+            
+        Returns:
+            Čakanie v sekundách pred ďalším pokusom
+            
+        Raises:
+            Exception: Pôvodná výnimka, ak sa nemá opakovať
+        """
+        delay = BASE_DELAY * (2 ** attempt)
+        last_attempt = attempt >= MAX_RETRIES - 1
+        
+        if isinstance(error, RateLimitError):
+            logger.warning(f"Rate limit hit on attempt {attempt + 1}: {error}")
+            if last_attempt:
+                logger.error("Max retries exceeded for rate limit")
+                raise error
+            delay = self._server_delay(error, delay, attempt)
+            logger.info(f"Retrying in {delay}s...")
+            
+        elif isinstance(error, APIConnectionError):
+            logger.warning(f"Connection error on attempt {attempt + 1}: {error}")
+            if last_attempt:
+                logger.error("Max retries exceeded for connection error")
+                raise error
+            logger.info(f"Retrying in {delay}s...")
+            
+        elif isinstance(error, APIError):
+            logger.error(f"API error on attempt {attempt + 1}: {error}")
+            if last_attempt or error.status_code < 500:
+                logger.error("Non-retryable API error or max retries exceeded")
+                raise error
+            if error.status_code == 529:  # Overloaded - server may say when to retry
+                delay = self._server_delay(error, delay, attempt)
+            logger.info(f"Server error, retrying in {delay}s...")
+            
+        else:
+            logger.error(f"Unexpected error: {type(error).__name__}: {error}")
+            raise error
+        
+        return delay
+    
+    def _server_delay(self, error: "APIError", default: float, attempt: int) -> float:
+        """
+        Čakanie podľa retry-after hlavičky servera, inak exponenciálny backoff.
+        
+        Args:
+            error: Výnimka s HTTP response (429 / 529)
+            default: Exponenciálny backoff pre prípad bez hlavičky
+            attempt: Index pokusu (od 0), iba pre log
+            
+        Returns:
+            Čakanie v sekundách
+        """
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        if headers is None:
+            return default
+        
+        # retry-after-ms (Anthropic) is more precise than retry-after (seconds)
+        for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+            try:
+                seconds = float(headers.get(header)) * scale
+            except (TypeError, ValueError):
+                continue  # missing or an HTTP-date
+            if seconds >= 0:
+                logger.info(f"Server {header}={headers.get(header)} on attempt {attempt + 1}")
+                return seconds
+        
+        return default
+    
+    def _system_blocks(self, system: str) -> List[Dict[str, Any]]:
+        """
+        Zabalí system prompt do bloku s prompt caching.
+        
+        System prompt je pri všetkých volaniach rovnaký, takže Anthropic
+        ho pri opakovaní číta z cache za zlomok ceny input tokenov.
+        
+        Args:
+            system: System prompt
+            
+        Returns:
+            System bloky pre messages.create
+        """
+        return [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+    
+    def count_tokens(self, messages: List[Dict[str, Any]], system: str) -> int:
+        """
+        Spočíta input tokeny promptu cez count_tokens API (s cache).
+        
+        Výsledok sa cachuje podľa hashu system promptu a správ, takže
+        opakovaný prompt nestojí ďalší round-trip.
+        
+        Args:
+            messages: Zoznam správ
+            system: System prompt
+            
+        Returns:
+            Počet input tokenov
+        """
+        key = self._token_count_key(messages, system)
+        tokens = self._token_counts.get(key)
+        if tokens is None:
+            tokens = self.client.messages.count_tokens(
+                model=self.model,
+                system=self._system_blocks(system),
+                messages=messages
+            ).input_tokens
+            self._token_counts.set(key, tokens)
+        
+        return tokens
+    
+    async def count_tokens_async(self, messages: List[Dict[str, Any]], system: str) -> int:
+        """
+        Asynchrónna verzia count_tokens (zdieľa s ňou cache).
+        
+        Args:
+            messages: Zoznam správ
+            system: System prompt
+            
+        Returns:
+            Počet input tokenov
+        """
+        key = self._token_count_key(messages, system)
+        tokens = self._token_counts.get(key)
+        if tokens is None:
+            response = await self.async_client.messages.count_tokens(
+                model=self.model,
+                system=self._system_blocks(system),
+                messages=messages
+            )
+            tokens = response.input_tokens
+            self._token_counts.set(key, tokens)
+        
+        return tokens
+    
+    def _token_count_key(self, messages: List[Dict[str, Any]], system: str) -> str:
+        """Vráti cache kľúč token countu - blake2b hash system promptu a správ."""
+        payload = json.dumps({"s": system, "m": messages}, sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _fits_by_size(self, messages: List[Dict[str, Any]], system: str) -> bool:
+        """
+        Lacná kontrola bez API: token nemá menej ako 1 bajt UTF-8, takže
+        prompt do MAX_PROMPT_TOKENS bajtov sa zmestí vždy.
+        
+        Sčíta iba dĺžky textov (bez serializácie celého promptu); správa
+        s iným než textovým blokom ide vždy cez count_tokens.
+        """
+        size = _utf8_size(system)
+        for message in messages:
+            content = message["content"]
+            if isinstance(content, str):
+                size += _utf8_size(content)
+                continue
+            for block in content:
+                text = block.get("text")
+                if not isinstance(text, str):
+                    return False
+                size += _utf8_size(text)
+        return size <= MAX_PROMPT_TOKENS
+    
+    def _check_prompt_tokens(self, tokens: int):
+        """Vyhodí ValueError, ak prompt presahuje MAX_PROMPT_TOKENS."""
+        if tokens > MAX_PROMPT_TOKENS:
+            raise ValueError(f"Prompt too large: {tokens} tokens (max {MAX_PROMPT_TOKENS})")
+    
+    def _ensure_prompt_fits(self, messages: List[Dict[str, Any]], system: str):
+        """
+        Odmietne príliš veľký prompt ešte pred API volaním.
+        
+        count_tokens sa volá iba pre prompty väčšie ako MAX_PROMPT_TOKENS
+        bajtov (pozri _fits_by_size).
+        
+        Args:
+            messages: Zoznam správ
+            system: System prompt
+            
+        Raises:
+            ValueError: Ak prompt presahuje MAX_PROMPT_TOKENS
+        """
+        if not self._fits_by_size(messages, system):
+            self._check_prompt_tokens(self.count_tokens(messages, system))
+    
+    async def _ensure_prompt_fits_async(self, messages: List[Dict[str, Any]], system: str):
+        """
+        Asynchrónna verzia _ensure_prompt_fits (count_tokens cez async client).
+        
+        Args:
+            messages: Zoznam správ
+            system: System prompt
+            
+        Raises:
+            ValueError: Ak prompt presahuje MAX_PROMPT_TOKENS
+        """
+        if not self._fits_by_size(messages, system):
+            self._check_prompt_tokens(await self.count_tokens_async(messages, system))
+    
     def _call_claude_api(
         self,
         messages: List[Dict[str, str]],
         system: str,
-        max_tokens: int = 8000
+        max_tokens: int = 8000,
+        **options: Any
     ) -> Dict[str, Any]:
         """
         Interná funkcia pre volanie Claude API s retry mechanikou.
@@ -178,104 +1080,150 @@ Formátuj odpoveď jasne a štruktúrovane v slovenčine."""
             messages: Zoznam správ
             system: System prompt
             max_tokens: Maximálny počet tokenov
+            **options: Ďalšie parametre pre messages.create (napr. tools)
             
         Returns:
             Dict s response, token_usage, cost, model
             
         Raises:
+            ValueError: Ak prompt presahuje MAX_PROMPT_TOKENS
             APIError: Po vyčerpaní retry pokusov
         """
-        max_retries = 3
-        base_delay = 1.0
+        self._ensure_prompt_fits(messages, system)
         
-        for attempt in range(max_retries):
+        for attempt in range(MAX_RETRIES):
+            logger.debug(f"API call attempt {attempt + 1}/{MAX_RETRIES}")
             try:
-                logger.debug(f"API call attempt {attempt + 1}/{max_retries}")
-                
                 response = self.client.messages.create(
                     model=self.model,
                     max_tokens=max_tokens,
-                    system=system,
-                    messages=messages
-                )
-                
-                input_tokens = response.usage.input_tokens
-                output_tokens = response.usage.output_tokens
-                total_tokens = input_tokens + output_tokens
-                
-                cost = self.calculate_cost(input_tokens, output_tokens)
-                
-                result = {
-                    "response": response.content[0].text,
-                    "token_usage": {
-                        "input": input_tokens,
-                        "output": output_tokens,
-                        "total": total_tokens
-                    },
-                    "cost": cost,
-                    "model": self.model
-                }
-                
-                logger.info(
-                    f"API call successful: input={input_tokens}, output={output_tokens}, cost=${cost:.6f}"
+                    system=self._system_blocks(system),
+                    messages=messages,
+                    **options
                 )
-                
-                return result
-                
-            except RateLimitError as e:
-                logger.warning(f"Rate limit hit on attempt {attempt + 1}: {e}")
-                
-                if attempt < max_retries - 1:
-                    delay = base_delay * (2 ** attempt)
-                    logger.info(f"Retrying in {delay}s...")
-                    time.sleep(delay)
-                else:
-                    logger.error("Max retries exceeded for rate limit")
-                    raise
-                    
-            except APIConnectionError as e:
-                logger.warning(f"Connection error on attempt {attempt + 1}: {e}")
-                
-                if attempt < max_retries - 1:
-                    delay = base_delay * (2 ** attempt)
-                    logger.info(f"Retrying in {delay}s...")
-                    time.sleep(delay)
-                else:
-                    logger.error("Max retries exceeded for connection error")
-                    raise
-                    
-            except APIError as e:
-                logger.error(f"API error on attempt {attempt + 1}: {e}")
-                
-                if attempt < max_retries - 1 and e.status_code >= 500:
-                    delay = base_delay * (2 ** attempt)
-                    logger.info(f"Server error, retrying in {delay}s...")
-                    time.sleep(delay)
-                else:
-                    logger.error("Non-retryable API error or max retries exceeded")
-                    raise
-                    
             except Exception as e:
-                logger.error(f"Unexpected error: {type(e).__name__}: {e}")
-                raise
+                self._sleep(self._retry_delay(e, attempt))
+                continue
+            
+            return self._build_result(response)
+    
+    async def _call_claude_api_async(
+        self,
+        messages: List[Dict[str, str]],
+        system: str,
+        max_tokens: int = 8000,
+        **options: Any
+    ) -> Dict[str, Any]:
+        """
+        Asynchrónne volanie Claude API s rovnakou retry mechanikou.
+        
+        Backoff čaká cez asyncio.sleep, takže ostatné requesty na tom
+        istom event loope bežia ďalej. Naraz beží najviac
+        MAX_CONCURRENT_REQUESTS volaní; počas backoffu sa slot uvoľní.
+        
+        Args:
+            messages: Zoznam správ
+            system: System prompt
+            max_tokens: Maximálny počet tokenov
+            **options: Ďalšie parametre pre messages.create (napr. tools)
+            
+        Returns:
+            Dict s response, token_usage, cost, model
+            
+        Raises:
+            ValueError: Ak prompt presahuje MAX_PROMPT_TOKENS
+            APIError: Po vyčerpaní retry pokusov
+        """
+        await self._ensure_prompt_fits_async(messages, system)
+        
+        for attempt in range(MAX_RETRIES):
+            logger.debug(f"Async API call attempt {attempt + 1}/{MAX_RETRIES}")
+            try:
+                async with self._semaphore:
+                    response = await self.async_client.messages.create(
+                        model=self.model,
+                        max_tokens=max_tokens,
+                        system=self._system_blocks(system),
+                        messages=messages,
+                        **options
+                    )
+            except Exception as e:
+                await asyncio.sleep(self._retry_delay(e, attempt))
+                continue
+            
+            return self._build_result(response)
     
-    def calculate_cost(self, input_tokens: int, output_tokens: int) -> float:
+    def calculate_cost(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0
+    ) -> float:
         """
         Vypočíta náklady pre Claude Sonnet 4.5.
         
         Pricing:
         - Input: $3 per million tokens
         - Output: $15 per million tokens
+        - Cache read: $0.30 per million tokens
+        - Cache write: $3.75 per million tokens
         
         Args:
-            input_tokens: Počet input tokenov
+            input_tokens: Počet input tokenov (bez cache)
             output_tokens: Počet output tokenov
+            cache_read_tokens: Počet tokenov prečítaných z prompt cache
+            cache_write_tokens: Počet tokenov zapísaných do prompt cache
             
         Returns:
             Celková cena v USD
         """
-        input_cost = (input_tokens / 1_000_000) * 3.0
-        output_cost = (output_tokens / 1_000_000) * 15.0
-        total_cost = input_cost + output_cost
+        price_units = (
+            input_tokens * self.PRICE_INPUT
+            + output_tokens * self.PRICE_OUTPUT
+            + cache_read_tokens * self.PRICE_CACHE_READ
+            + cache_write_tokens * self.PRICE_CACHE_WRITE
+        )
+        
+        return price_units * self.USD_PER_PRICE_UNIT
+    
+    def calculate_cost_bulk(self, input_tokens: "np.ndarray", output_tokens: "np.ndarray") -> "np.ndarray":
+        """
+        Vypočíta náklady pre celé pole volaní naraz (NumPy).
+        
+        Rovnaký vzorec ako calculate_cost, ale jeden np.dot cez int64
+        tokeny a cenový vektor namiesto Python slučky - pre súhrny cez
+        veľa konverzačných turnov.
+        
+        Args:
+            input_tokens: Pole počtov input tokenov
+            output_tokens: Pole počtov output tokenov
+            
+        Returns:
+            Pole cien v USD (float64), prvok po prvku zhodné s calculate_cost
+        """
+        import numpy as np
+        
+        tokens = np.column_stack((input_tokens, output_tokens)).astype(np.int64)
+        prices = np.array((self.PRICE_INPUT, self.PRICE_OUTPUT), dtype=np.int64)
+        
+        return np.dot(tokens, prices) * self.USD_PER_PRICE_UNIT
+
+
+@lru_cache(maxsize=1)
+def get_claude_client() -> ClaudeClient:
+    """
+    Vráti zdieľaný ClaudeClient nakonfigurovaný z get_settings().
+    
+    Vytvorí sa raz na proces; vhodné ako FastAPI dependency
+    (Depends(get_claude_client)), v testoch sa dá prepísať. Async
+    client a semafor si klient drží zvlášť pre každý event loop, takže
+    zdieľaný klient funguje aj naprieč viacerými asyncio.run.
+    
+    Returns:
+        Zdieľaný ClaudeClient
         
-        return total_cost
\ No newline at end of file
+    Raises:
+        ValueError: Ak chýba API key
+    """
+    return ClaudeClient(get_settings())
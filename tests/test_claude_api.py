@@ -1,17 +1,34 @@
 """Comprehensive test suite pre Claude API wrapper."""
 
+import asyncio
+
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import AsyncMock, Mock, MagicMock, patch
 from anthropic import APIError, RateLimitError, APIConnectionError
-from utils.config import Settings
-from services.claude_api import ClaudeClient
+from utils.config import Settings, get_settings
+from services.claude_api import ClaudeClient, TTLCache, get_claude_client, get_http_client
 
 
 # ============================================================================
 # FIXTURES
 # ============================================================================
 
-@pytest.fixture
+class _StubMessages:
+    """Stub pre Anthropic.messages - testy priraďujú create/count_tokens."""
+    
+    def create(self, **kwargs):
+        return None
+
+
+class _StubAnthropic:
+    """Ľahká náhrada Anthropic SDK klienta (bez MagicMock)."""
+    
+    def __init__(self, api_key, http_client=None):
+        self.api_key = api_key
+        self.messages = _StubMessages()
+
+
+@pytest.fixture(scope="module")
 def mock_config():
     """Mock Settings objekt s API key."""
     config = Mock(spec=Settings)
@@ -19,7 +36,7 @@ def mock_config():
     return config
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_config_no_key():
     """Mock Settings objekt bez API key."""
     config = Mock(spec=Settings)
@@ -28,10 +45,14 @@ def mock_config_no_key():
 
 
 @pytest.fixture
-def client(mock_config):
-    """ClaudeClient instance s mock configom."""
-    with patch('services.claude_api.Anthropic'):
-        return ClaudeClient(mock_config)
+def client(mock_config, monkeypatch):
+    """ClaudeClient instance s mock configom.
+    
+    Function scope: klient drží response/health cache a semafor,
+    ktoré by zdieľaný klient prenášal medzi testami.
+    """
+    monkeypatch.setattr('services.claude_api.Anthropic', _StubAnthropic)
+    return ClaudeClient(mock_config, sleep=Mock())
 
 
 @pytest.fixture
@@ -39,12 +60,17 @@ def mock_anthropic_response():
     """Mock Anthropic API response."""
     response = Mock()
     response.content = [Mock(text="Test response from Claude")]
-    response.usage = Mock(input_tokens=100, output_tokens=200)
+    response.usage = Mock(
+        input_tokens=100,
+        output_tokens=200,
+        cache_read_input_tokens=None,
+        cache_creation_input_tokens=None
+    )
     return response
 
 
 # ============================================================================
-# 1. INITIALIZATION TESTS (3 tests)
+# 1. INITIALIZATION TESTS (6 tests)
 # ============================================================================
 
 def test_claude_client_init_success(mock_config):
@@ -55,7 +81,42 @@ def test_claude_client_init_success(mock_config):
         assert client.config == mock_config
         assert client.model == "claude-sonnet-4-5-20250929"
         assert client.max_tokens == 8000
-        mock_anthropic.assert_called_once_with(api_key="test-api-key-123")
+        mock_anthropic.assert_called_once_with(
+            api_key="test-api-key-123",
+            http_client=get_http_client()
+        )
+
+
+def test_claude_clients_share_http_client(mock_config):
+    """Test že všetky ClaudeClient inštancie zdieľajú jeden connection pool."""
+    with patch('services.claude_api.Anthropic') as mock_anthropic:
+        ClaudeClient(mock_config)
+        ClaudeClient(mock_config)
+    
+    first, second = mock_anthropic.call_args_list
+    assert first.kwargs['http_client'] is second.kwargs['http_client']
+
+
+def test_shared_http_client_accepted_by_sdk(mock_config):
+    """Test že skutočný Anthropic SDK prijme zdieľaný http client."""
+    client = ClaudeClient(mock_config)
+    
+    assert client.client._client is get_http_client()
+
+
+def test_get_claude_client_is_singleton(mock_config):
+    """Test že get_claude_client vytvorí ClaudeClient iba raz."""
+    get_claude_client.cache_clear()
+    try:
+        with patch('services.claude_api.get_settings', return_value=mock_config), \
+                patch('services.claude_api.Anthropic'):
+            first = get_claude_client()
+            second = get_claude_client()
+    finally:
+        get_claude_client.cache_clear()
+    
+    assert first is second
+    assert first.config is mock_config
 
 
 def test_claude_client_init_missing_api_key(mock_config_no_key):
@@ -102,7 +163,7 @@ def test_system_prompt_contains_uae_requirements(client):
 
 
 # ============================================================================
-# 3. LEGAL ANALYSIS TESTS (5 tests)
+# 3. LEGAL ANALYSIS TESTS (17 tests)
 # ============================================================================
 
 def test_analyze_legal_case_success(client, mock_anthropic_response):
@@ -147,6 +208,34 @@ def test_analyze_legal_case_with_history(client, mock_anthropic_response):
     assert result["response"] == "Test response from Claude"
 
 
+def test_analyze_legal_case_caches_legal_context(client, mock_anthropic_response):
+    """Test že zákony a koniec histórie sú označené pre prompt cache."""
+    client.client.messages.create = Mock(return_value=mock_anthropic_response)
+    
+    history = [
+        {"role": "user", "content": "Previous question"},
+        {"role": "assistant", "content": "Previous answer"}
+    ]
+    
+    client.analyze_legal_case(
+        case_context="Test case",
+        legal_context="Federal Law No. 33/2021",
+        query="Test query",
+        history=history
+    )
+    
+    messages = client.client.messages.create.call_args.kwargs['messages']
+    legal_block, case_block = messages[-1]["content"]
+    
+    assert "Federal Law No. 33/2021" in legal_block["text"]
+    assert legal_block["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in case_block
+    assert "Test query" in case_block["text"]
+    assert messages[1]["content"][-1]["cache_control"] == {"type": "ephemeral"}
+    # Caller's history must stay untouched
+    assert history[1]["content"] == "Previous answer"
+
+
 def test_analyze_legal_case_empty_context(client, mock_anthropic_response):
     """Test analýzy s prázdnym kontextom - mal by stále fungovať."""
     client.client.messages.create = Mock(return_value=mock_anthropic_response)
@@ -185,19 +274,251 @@ def test_analyze_legal_case_rate_limit(client, mock_anthropic_response):
         ]
     )
     
-    with patch('time.sleep'):  # Mock sleep to speed up test
-        result = client.analyze_legal_case(
+    result = client.analyze_legal_case(
+        case_context="Test",
+        legal_context="Test",
+        query="Test"
+    )
+    
+    assert result["response"] == "Test response from Claude"
+    assert client.client.messages.create.call_count == 2
+
+
+def test_rate_limit_honors_retry_after_header(client, mock_anthropic_response):
+    """Test že retry čaká presne podľa retry-after hlavičky servera."""
+    response = Mock(status_code=429, headers={"retry-after": "0.25"})
+    client.client.messages.create = Mock(
+        side_effect=[
+            RateLimitError("Rate limit", response=response, body={}),
+            mock_anthropic_response
+        ]
+    )
+    
+    result = client.analyze_legal_case(
+        case_context="Test",
+        legal_context="Test",
+        query="Test"
+    )
+    
+    assert result["response"] == "Test response from Claude"
+    client._sleep.assert_called_once_with(0.25)
+
+
+def test_analyze_legal_case_async_rate_limit(client, mock_anthropic_response):
+    """Test async analýzy - retry čaká cez asyncio.sleep, nie time.sleep."""
+    client.async_client = Mock()
+    client.async_client.messages.create = AsyncMock(
+        side_effect=[
+            RateLimitError("Rate limit", response=Mock(status_code=429), body={}),
+            mock_anthropic_response
+        ]
+    )
+    
+    with patch('asyncio.sleep', new=AsyncMock()) as mock_sleep:
+        result = asyncio.run(client.analyze_legal_case_async(
             case_context="Test",
             legal_context="Test",
             query="Test"
-        )
+        ))
     
     assert result["response"] == "Test response from Claude"
-    assert client.client.messages.create.call_count == 2
+    assert client.async_client.messages.create.await_count == 2
+    mock_sleep.assert_awaited_once_with(1.0)
+    client._sleep.assert_not_called()
+
+
+def test_analyze_legal_case_response_cache(client, mock_anthropic_response):
+    """Test že zhodná otázka sa druhýkrát vráti z cache bez API volania."""
+    client.client.messages.create = Mock(return_value=mock_anthropic_response)
+    
+    first = client.analyze_legal_case(case_context="Case", legal_context="Law", query="Query")
+    second = client.analyze_legal_case(case_context="Case", legal_context="Law", query="Query")
+    
+    assert client.client.messages.create.call_count == 1
+    assert second["response"] == first["response"]
+    assert second["cost"] == 0.0
+    assert second["token_usage"]["cache_hit"] is True
+    assert "cache_hit" not in first["token_usage"]
+
+
+def test_response_cache_isolated_from_caller_mutation(client, mock_anthropic_response):
+    """Test že úprava vráteného výsledku nepoškodí neskorší cache hit."""
+    client.client.messages.create = Mock(return_value=mock_anthropic_response)
+    
+    first = client.analyze_legal_case(case_context="Case", legal_context="Law", query="Query")
+    first["token_usage"]["input"] = -1
+    first["token_usage"]["tampered"] = True
+    second = client.analyze_legal_case(case_context="Case", legal_context="Law", query="Query")
+    
+    assert second["token_usage"]["input"] == 100
+    assert "tampered" not in second["token_usage"]
+
+
+def test_response_cache_expires_after_ttl():
+    """Test že položka response cache po uplynutí TTL zmizne."""
+    cache = TTLCache(maxsize=2, ttl=600.0)
+    
+    with patch('services.claude_api.time.monotonic', return_value=1000.0):
+        cache.set("key", "value")
+    with patch('services.claude_api.time.monotonic', return_value=1599.0):
+        assert cache.get("key") == "value"
+    with patch('services.claude_api.time.monotonic', return_value=1600.0):
+        assert cache.get("key") is None
+
+
+def test_analyze_legal_case_async_coalesces_duplicates(client, mock_anthropic_response):
+    """Test že súbežné zhodné požiadavky spravia iba jedno API volanie."""
+    async def slow_create(**kwargs):
+        await asyncio.sleep(0)
+        return mock_anthropic_response
+    
+    client.async_client = Mock()
+    client.async_client.messages.create = AsyncMock(side_effect=slow_create)
+    
+    async def run():
+        return await asyncio.gather(*(
+            client.analyze_legal_case_async(
+                case_context="Test case",
+                legal_context="Test legal",
+                query="Same query"
+            )
+            for _ in range(3)
+        ))
+    
+    results = asyncio.run(run())
+    
+    assert client.async_client.messages.create.await_count == 1
+    assert all(result["response"] == "Test response from Claude" for result in results)
+    
+    # Each waiter owns its result - mutating one must not leak into the others
+    results[0]["token_usage"]["input"] = -1
+    results[0]["response"] = "edited"
+    assert results[1]["token_usage"]["input"] == 100
+    assert results[2]["response"] == "Test response from Claude"
+
+
+def test_analyze_legal_cases_async_batch(client, mock_anthropic_response):
+    """Test dávkovej analýzy - poradie výsledkov, duplikáty a chyby."""
+    async def fake_create(**kwargs):
+        await asyncio.sleep(0)
+        if "Broken case" in kwargs["messages"][-1]["content"][-1]["text"]:
+            raise ValueError("Invalid request")
+        return mock_anthropic_response
+    
+    client.async_client = Mock()
+    client.async_client.messages.create = AsyncMock(side_effect=fake_create)
+    case = {"case_context": "Test case", "legal_context": "Test legal", "query": "Test query"}
+    broken = {**case, "case_context": "Broken case"}
+    
+    results = asyncio.run(client.analyze_legal_cases_async([case, broken, case]))
+    
+    assert results[0]["response"] == "Test response from Claude"
+    assert isinstance(results[1], ValueError)
+    assert results[2] == results[0]
+    assert client.async_client.messages.create.call_count == 2
+
+
+def test_async_calls_bounded_by_semaphore(client, mock_anthropic_response):
+    """Test že súbežné async volania neprekročia limit semaforu."""
+    in_flight = 0
+    peak = 0
+    
+    async def fake_create(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        for _ in range(3):
+            await asyncio.sleep(0)
+        in_flight -= 1
+        return mock_anthropic_response
+    
+    client.async_client = Mock()
+    client.async_client.messages.create = fake_create
+    client._semaphore = asyncio.Semaphore(2)
+    cases = [
+        {"case_context": f"Case {i}", "legal_context": "Test legal", "query": "Test query"}
+        for i in range(5)
+    ]
+    
+    results = asyncio.run(client.analyze_legal_cases_async(cases))
+    
+    assert peak == 2
+    assert all(r["response"] == "Test response from Claude" for r in results)
+
+
+def test_async_state_is_per_event_loop(client):
+    """Test že každý event loop dostane vlastný async client a semafor."""
+    async def loop_state():
+        return client.async_client, client._semaphore
+    
+    first_client, first_semaphore = asyncio.run(loop_state())
+    second_client, second_semaphore = asyncio.run(loop_state())
+    
+    assert second_client is not first_client
+    assert second_semaphore is not first_semaphore
+    # State of the closed first loop is dropped
+    assert len(client._loop_clients) == 1
+    assert len(client._loop_semaphores) == 1
+
+
+def test_analyze_legal_case_structured_tool_use(client, mock_anthropic_response):
+    """Test štruktúrovanej analýzy - výsledok príde ako tool input JSON."""
+    tool_input = {
+        "analysis": "Zamestnanec má nárok na odstupné.",
+        "alternatives": ["Mediácia", "Žaloba na MOHRE"],
+        "risk_assessment": "Low"
+    }
+    mock_anthropic_response.content = [Mock(type="tool_use", input=tool_input)]
+    client.client.messages.create = Mock(return_value=mock_anthropic_response)
+    
+    result = client.analyze_legal_case_structured(
+        case_context="Employment dispute",
+        legal_context="UAE Labor Law",
+        query="What are employee rights?"
+    )
+    
+    kwargs = client.client.messages.create.call_args.kwargs
+    assert kwargs["tool_choice"] == {"type": "tool", "name": "legal_analysis"}
+    assert result["alternatives"] == ["Mediácia", "Žaloba na MOHRE"]
+    assert result["analysis"] == tool_input["analysis"]
+    assert result["token_usage"]["input"] == 100
+    assert "response" not in result
+
+
+def test_stream_analyze_yields_chunks(client, mock_anthropic_response):
+    """Test streamovanej analýzy - text prichádza po častiach."""
+    class FakeStream:
+        async def __aenter__(self):
+            return self
+        
+        async def __aexit__(self, *exc_info):
+            return False
+        
+        @property
+        async def text_stream(self):
+            for chunk in ("Analýza ", "prípadu"):
+                yield chunk
+        
+        async def get_final_message(self):
+            return mock_anthropic_response
+    
+    client.async_client = Mock()
+    client.async_client.messages.stream = Mock(return_value=FakeStream())
+    
+    async def collect():
+        return [chunk async for chunk in client.stream_analyze(
+            case_context="Test case",
+            legal_context="Test legal",
+            query="Test query"
+        )]
+    
+    assert asyncio.run(collect()) == ["Analýza ", "prípadu"]
+    kwargs = client.async_client.messages.stream.call_args.kwargs
+    assert kwargs["max_tokens"] == client.max_tokens
 
 
 # ============================================================================
-# 4. ALTERNATIVES GENERATION TESTS (3 tests)
+# 4. ALTERNATIVES GENERATION TESTS (4 tests)
 # ============================================================================
 
 def test_generate_alternatives_success(client, mock_anthropic_response):
@@ -248,8 +569,35 @@ def test_generate_alternatives_risk_assessment(client, mock_anthropic_response):
     assert "Low" in user_message or "Medium" in user_message or "High" in user_message
 
 
+def test_analyze_with_alternatives_async_runs_concurrently(client, mock_anthropic_response):
+    """Test že analýza a alternatívy bežia súbežne cez asyncio.gather."""
+    in_flight = 0
+    peak = 0
+    
+    async def fake_create(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return mock_anthropic_response
+    
+    client.async_client = Mock()
+    client.async_client.messages.create = fake_create
+    
+    result = asyncio.run(client.analyze_with_alternatives_async(
+        case_context="Test case",
+        legal_context="Test legal",
+        query="Test query"
+    ))
+    
+    assert peak == 2
+    assert result["analysis"]["response"] == "Test response from Claude"
+    assert result["alternatives"]["response"] == "Test response from Claude"
+
+
 # ============================================================================
-# 5. API CALL TESTS (4 tests)
+# 5. API CALL TESTS (8 tests)
 # ============================================================================
 
 def test_call_claude_api_success(client, mock_anthropic_response):
@@ -271,35 +619,102 @@ def test_call_claude_api_retry_on_error(client, mock_anthropic_response):
     """Test retry mechaniky pri connection error."""
     client.client.messages.create = Mock(
         side_effect=[
-            Exception("Connection failed"),
+            APIConnectionError(message="Connection failed", request=Mock()),
             mock_anthropic_response
         ]
     )
     
-    with patch('time.sleep'):
-        result = client._call_claude_api(
-            messages=[{"role": "user", "content": "Test"}],
-            system="Test system"
-        )
+    result = client._call_claude_api(
+        messages=[{"role": "user", "content": "Test"}],
+        system="Test system"
+    )
     
     assert result["response"] == "Test response from Claude"
     assert client.client.messages.create.call_count == 2
+    client._sleep.assert_called_once_with(1.0)
 
 
 def test_call_claude_api_max_retries_exceeded(client):
     """Test že po max retries sa vyhodí exception."""
     client.client.messages.create = Mock(
-        side_effect=Exception("Max retries exceeded")
+        side_effect=APIConnectionError(message="Max retries exceeded", request=Mock())
     )
     
-    with patch('time.sleep'):
-        with pytest.raises(Exception):
-            client._call_claude_api(
-                messages=[{"role": "user", "content": "Test"}],
-                system="Test system"
-            )
+    with pytest.raises(APIConnectionError):
+        client._call_claude_api(
+            messages=[{"role": "user", "content": "Test"}],
+            system="Test system"
+        )
     
     assert client.client.messages.create.call_count == 3
+    assert [c.args for c in client._sleep.call_args_list] == [(1.0,), (2.0,)]
+
+
+def test_call_claude_api_rejects_oversized_prompt(client):
+    """Test že príliš veľký prompt sa odmietne bez volania messages.create."""
+    client.client.messages.count_tokens = Mock(return_value=Mock(input_tokens=250_000))
+    client.client.messages.create = Mock()
+    messages = [{"role": "user", "content": "x" * 200_000}]
+    
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Prompt too large"):
+            client._call_claude_api(messages=messages, system="Test system")
+    
+    client.client.messages.create.assert_not_called()
+    # Token count is cached by prompt hash
+    assert client.client.messages.count_tokens.call_count == 1
+
+
+def test_call_claude_api_async_rejects_oversized_prompt(client):
+    """Test že async volanie a stream odmietnu príliš veľký prompt bez API volania."""
+    client.async_client = Mock()
+    client.async_client.messages.count_tokens = AsyncMock(return_value=Mock(input_tokens=250_000))
+    client.async_client.messages.create = AsyncMock()
+    client.async_client.messages.stream = Mock()
+    messages = [{"role": "user", "content": "x" * 200_000}]
+    
+    with pytest.raises(ValueError, match="Prompt too large"):
+        asyncio.run(client._call_claude_api_async(messages=messages, system="Test system"))
+    
+    async def stream():
+        return [chunk async for chunk in client.stream_analyze(
+            case_context="x" * 200_000,
+            legal_context="Test legal",
+            query="Test query"
+        )]
+    
+    with pytest.raises(ValueError, match="Prompt too large"):
+        asyncio.run(stream())
+    
+    client.async_client.messages.create.assert_not_called()
+    client.async_client.messages.stream.assert_not_called()
+
+
+def test_check_connection_async(client, mock_anthropic_response):
+    """Test async health probe - True pri odpovedi, False pri chybe."""
+    client.async_client = Mock()
+    client.async_client.messages.create = AsyncMock(return_value=mock_anthropic_response)
+    
+    assert asyncio.run(client.check_connection_async()) is True
+    assert client.async_client.messages.create.call_args.kwargs["max_tokens"] == 1
+    
+    client._health_cache = TTLCache(1, 30.0)
+    client.async_client.messages.create = AsyncMock(side_effect=Exception("Connection refused"))
+    
+    assert asyncio.run(client.check_connection_async()) is False
+
+
+def test_check_connection_async_cached(client, mock_anthropic_response):
+    """Test že opakované a súbežné health probe volajú API iba raz."""
+    client.async_client = Mock()
+    client.async_client.messages.create = AsyncMock(return_value=mock_anthropic_response)
+    
+    async def run():
+        first = await asyncio.gather(*(client.check_connection_async() for _ in range(3)))
+        return first + [await client.check_connection_async()]
+    
+    assert asyncio.run(run()) == [True] * 4
+    assert client.async_client.messages.create.call_count == 1
 
 
 def test_call_claude_api_token_tracking(client, mock_anthropic_response):
@@ -317,7 +732,7 @@ def test_call_claude_api_token_tracking(client, mock_anthropic_response):
 
 
 # ============================================================================
-# 6. COST CALCULATION TESTS (3 tests)
+# 6. COST CALCULATION TESTS (6 tests)
 # ============================================================================
 
 def test_calculate_cost_basic(client):
@@ -344,8 +759,49 @@ def test_calculate_cost_large_numbers(client):
     assert cost == pytest.approx(expected, rel=1e-9)
 
 
+def test_calculate_cost_prompt_cache(client):
+    """Test že tokeny z prompt cache sa účtujú zníženou sadzbou."""
+    cost = client.calculate_cost(
+        input_tokens=0,
+        output_tokens=0,
+        cache_read_tokens=1_000_000,
+        cache_write_tokens=1_000_000
+    )
+    
+    # 1M cache read = $0.30, 1M cache write = $3.75
+    assert cost == pytest.approx(0.30 + 3.75, rel=1e-9)
+
+
+def test_call_claude_api_uses_prompt_cache(client, mock_anthropic_response):
+    """Test že system prompt sa posiela s cache_control."""
+    client.client.messages.create = Mock(return_value=mock_anthropic_response)
+    
+    client._call_claude_api(
+        messages=[{"role": "user", "content": "Test"}],
+        system="Test system"
+    )
+    
+    system = client.client.messages.create.call_args.kwargs['system']
+    assert system == [
+        {"type": "text", "text": "Test system", "cache_control": {"type": "ephemeral"}}
+    ]
+
+
+def test_calculate_cost_bulk_matches_scalar(client):
+    """Test že vektorový výpočet dáva rovnaké ceny ako calculate_cost."""
+    np = pytest.importorskip("numpy")
+    input_tokens = np.array([0, 100, 1_000_000, 123_457], dtype=np.int64)
+    output_tokens = np.array([0, 200, 500_000, 98_765], dtype=np.int64)
+    
+    costs = client.calculate_cost_bulk(input_tokens, output_tokens)
+    
+    assert costs.tolist() == [
+        client.calculate_cost(int(i), int(o)) for i, o in zip(input_tokens, output_tokens)
+    ]
+
+
 # ============================================================================
-# 7. INTEGRATION TESTS (3 tests)
+# 7. INTEGRATION TESTS (4 tests)
 # ============================================================================
 
 def test_full_legal_analysis_workflow(client, mock_anthropic_response):
@@ -424,4 +880,24 @@ def test_slovak_output_validation(client):
         
         # Verify system prompt was passed
         call_args = mock_call.call_args
-        assert call_args.kwargs['system'] == prompt
\ No newline at end of file
+        assert call_args.kwargs['system'] == prompt
+
+
+@pytest.mark.integration
+def test_claude_api_smoke():
+    """Live smoke test proti Claude API (spúšťa sa iba cez pytest -m integration)."""
+    config = get_settings()
+    if not config.anthropic_api_key:
+        pytest.skip("ANTHROPIC_API_KEY is not set")
+    
+    client = ClaudeClient(config)
+    # Always live - a replayed response could not catch a broken key, model or SDK
+    result = asyncio.run(client._call_claude_api_async(
+        messages=[{"role": "user", "content": "Odpovedz jedným slovom: funguje spojenie?"}],
+        system=client.get_legal_system_prompt(),
+        max_tokens=16
+    ))
+    
+    assert result["response"]
+    assert result["token_usage"]["output"] > 0
+    assert result["cost"] > 0
@@ -2,7 +2,7 @@
 import os
 import pytest
 from pydantic import ValidationError
-from utils.config import Settings
+from utils.config import Settings, get_settings
 
 
 class TestSettings:
@@ -200,4 +200,15 @@ class TestSettings:
         assert isinstance(settings.debug, bool)
         assert settings.debug is True
         assert isinstance(settings.db_pool_size, int)
-        assert settings.db_pool_size == 15
\ No newline at end of file
+        assert settings.db_pool_size == 15
+    
+    def test_get_settings_is_cached(self):
+        """Test that get_settings parses the environment only once."""
+        assert get_settings() is get_settings()
+    
+    def test_module_settings_is_lazy_singleton(self):
+        """Test that module-level settings resolves to the cached instance."""
+        import utils.config
+        
+        assert "settings" not in vars(utils.config)
+        assert utils.config.settings is get_settings()
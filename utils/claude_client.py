@@ -4,6 +4,8 @@ import os
 from typing import List, Optional, Dict
 from anthropic import Anthropic
 
+from utils.http_client import get_http_client
+
 # Try to import config, fallback to env vars
 try:
     from config import settings
@@ -35,7 +37,8 @@ class ClaudeClient:
         if not self.api_key:
             raise ValueError("CLAUDE_API_KEY nie je nastavený (skontroluj .env súbor)")
 
-        self.client = Anthropic(api_key=self.api_key)
+        # Shared keep-alive pool (HTTP/2 if h2 is installed) across all clients
+        self.client = Anthropic(api_key=self.api_key, http_client=get_http_client())
 
         # Get model from config or use default
         if model:
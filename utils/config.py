@@ -1,6 +1,7 @@
 # Enhanced configuration - v1.0
 """Configuration management module using Pydantic BaseSettings."""
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, validator, field_validator
 
@@ -18,6 +19,9 @@ class Settings(BaseSettings):
     api_port: int = Field(default=8000, description="API port")
     api_prefix: str = Field(default="/api/v1", description="API prefix")
 
+    # Anthropic
+    anthropic_api_key: Optional[str] = Field(default=None, description="Anthropic API key")
+
     # Database
     database_url: str = Field(default="sqlite:///./app.db", description="Database connection URL")
     db_echo: bool = Field(default=False, description="Echo SQL queries")
@@ -88,5 +92,14 @@ class Settings(BaseSettings):
         return self.app_env == "development"
 
 
-# Global settings instance
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings (env/.env parsed only once)."""
+    return Settings()
+
+
+def __getattr__(name: str) -> Any:
+    """Global `settings` instance, created on first access (not at import)."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
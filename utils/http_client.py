@@ -0,0 +1,57 @@
+"""Zdieľaný HTTP connection pool pre Anthropic SDK klientov."""
+
+import importlib.util
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    import httpx
+
+# h2 enables HTTP/2 in httpx; find_spec checks for it without importing it
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Connection pool shared by all Claude clients in the process
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 32
+HTTP_MAX_CONNECTIONS = 64
+# Long read timeout (SDK default) - non-streaming analyses can take minutes
+HTTP_READ_TIMEOUT = 600.0
+HTTP_CONNECT_TIMEOUT = 5.0
+
+
+def http_pool_options() -> Dict[str, Any]:
+    """
+    Vráti spoločné nastavenia httpx poolu (sync aj async client).
+
+    Limits/Timeout sa berú z SDK, nie z priameho importu httpx - SDK
+    odmietne http_client z inej httpx distribúcie, než akú samo používa.
+
+    Returns:
+        Kwargs pre DefaultHttpxClient / DefaultAsyncHttpxClient
+    """
+    import anthropic
+
+    Limits = type(anthropic.DEFAULT_CONNECTION_LIMITS)
+    return {
+        "http2": HTTP2_AVAILABLE,
+        "limits": Limits(
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            max_connections=HTTP_MAX_CONNECTIONS
+        ),
+        "timeout": anthropic.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+    }
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> "httpx.Client":
+    """
+    Vráti zdieľaný httpx client pre Anthropic API.
+
+    Jeden pool keep-alive spojení na proces: TCP+TLS handshake sa platí
+    raz, nie pri každom Claude klientovi alebo requeste.
+
+    Returns:
+        Zdieľaný httpx.Client
+    """
+    from anthropic import DefaultHttpxClient
+
+    return DefaultHttpxClient(**http_pool_options())
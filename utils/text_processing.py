@@ -2,6 +2,15 @@
 import re
 from typing import List
 
+# Patterns are compiled once at import - these run over whole PDF documents
+_WHITESPACE_RE = re.compile(r'\s+')
+# Federal Law No. X/YYYY
+_LAW_REFERENCE_RE = re.compile(r'(?:Federal\s+)?Law\s+No\.\s+\d+/\d{4}', re.IGNORECASE)
+# Keep: letters, numbers, spaces, Arabic characters (U+0600 to U+06FF)
+_SPECIAL_CHARS_ARABIC_RE = re.compile(r'[^\w\s\u0600-\u06FF]')
+# Keep only: ASCII letters, numbers, spaces
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s]')
+
 
 def clean_arabic_text(text: str) -> str:
     """
@@ -17,7 +26,7 @@ def clean_arabic_text(text: str) -> str:
         return ""
     
     # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = _WHITESPACE_RE.sub(' ', text)
     
     # Strip leading/trailing whitespace
     text = text.strip()
@@ -42,11 +51,8 @@ def extract_legal_references(text: str) -> List[str]:
     if not text:
         return []
     
-    # Pattern pre Federal Law No. X/YYYY
-    pattern = r'(?:Federal\s+)?Law\s+No\.\s+\d+/\d{4}'
-    
     # Find all matches
-    matches = re.findall(pattern, text, re.IGNORECASE)
+    matches = _LAW_REFERENCE_RE.findall(text)
     
     # Remove duplicates while preserving order
     seen = set()
@@ -128,17 +134,12 @@ def remove_special_chars(text: str, keep_arabic: bool = True) -> str:
     if not text:
         return ""
     
-    if keep_arabic:
-        # Keep: letters, numbers, spaces, Arabic characters (U+0600 to U+06FF)
-        pattern = r'[^\w\s\u0600-\u06FF]'
-    else:
-        # Keep only: ASCII letters, numbers, spaces
-        pattern = r'[^\w\s]'
+    pattern = _SPECIAL_CHARS_ARABIC_RE if keep_arabic else _SPECIAL_CHARS_RE
     
     # Remove special characters
-    cleaned = re.sub(pattern, '', text)
+    cleaned = pattern.sub('', text)
     
     # Normalize whitespace
-    cleaned = re.sub(r'\s+', ' ', cleaned)
+    cleaned = _WHITESPACE_RE.sub(' ', cleaned)
     
     return cleaned.strip()
\ No newline at end of file